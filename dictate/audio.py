@@ -1,10 +1,13 @@
 """Audio capture using parecord (PipeWire/PulseAudio)."""
 
+import os
 import subprocess
 import tempfile
 import time
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from shutil import which
 from typing import Optional
 
 
@@ -22,21 +25,12 @@ class AudioCapture:
             raise RuntimeError("Already recording")
 
         # Create temp file for recording
-        fd = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-        fd.close()
-        self.temp_file = Path(fd.name)
+        fd, name = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        self.temp_file = Path(name)
 
-        # Flush any stale audio in the buffer
-        flush = subprocess.Popen(
-            ["parecord", "--raw", "-n", "1"],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-        time.sleep(0.05)
-        flush.terminate()
-        flush.wait()
-
-        # Start recording at 16kHz mono (what Whisper expects)
+        # Start recording at 16kHz mono (what Whisper expects).
+        # Each parecord opens a fresh stream, so no stale-buffer flush is needed.
         # Use larger buffer (200ms) to prevent dropouts on longer recordings
         self.process = subprocess.Popen(
             [
@@ -71,9 +65,7 @@ class AudioCapture:
         self.process = None
         self.is_recording = False
 
-        # Small delay to ensure file is fully written
-        time.sleep(0.1)
-
+        # parecord has exited, so the file is complete
         return self.temp_file
 
     def cleanup(self) -> None:
@@ -83,11 +75,12 @@ class AudioCapture:
             self.temp_file = None
 
 
-def check_audio_dependencies() -> list[tuple[str, str]]:
-    """Check that audio dependencies are available. Returns list of (cmd, package) missing."""
-    missing = []
-    for cmd, pkg in [("parecord", "pulseaudio-utils")]:
-        result = subprocess.run(["which", cmd], capture_output=True)
-        if result.returncode != 0:
-            missing.append((cmd, pkg))
-    return missing
+@lru_cache(maxsize=1)
+def check_audio_dependencies() -> tuple[tuple[str, str], ...]:
+    """Check that audio dependencies are available. Returns (cmd, package) pairs missing.
+
+    A tuple, since the cached result is shared by every caller.
+    """
+    return tuple(
+        (cmd, pkg) for cmd, pkg in [("parecord", "pulseaudio-utils")] if which(cmd) is None
+    )
@@ -1,8 +1,9 @@
 """Configuration management for Dictate Agent."""
 
-from dataclasses import dataclass, field
+import os
+from dataclasses import dataclass, field, fields, replace
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 try:
     import tomllib
@@ -13,33 +14,46 @@ except ImportError:
 CONFIG_DIR = Path.home() / ".config" / "dictate-agent"
 CONFIG_FILE = CONFIG_DIR / "config.toml"
 PID_FILE = CONFIG_DIR / "dictate.pid"
-MEDIA_STATE_FILE = CONFIG_DIR / "media_was_playing"
+# Control socket for dictate-toggle/dictate-cancel (SIGUSR1/2 remain a fallback)
+CONTROL_SOCKET = Path(os.environ.get("XDG_RUNTIME_DIR") or CONFIG_DIR) / "dictate.sock"
+# Written by versions before media state moved in-memory; removed at startup
+LEGACY_MEDIA_STATE_FILE = CONFIG_DIR / "media_was_playing"
 
+# Parsed configs keyed on (path, mtime_ns) so unchanged files aren't re-parsed
+_config_cache: dict[tuple[str, int], "Config"] = {}
 
-@dataclass
+
+@dataclass(slots=True)
 class WhisperConfig:
     """Whisper transcription configuration."""
 
     model: str = "openai/whisper-large-v3-turbo"
     assistant_model: str = "distil-whisper/distil-large-v3"
     device: str = "cuda"
-    compute_type: str = "float16"
-    use_speculative_decoding: bool = True
+    compute_type: str = "bfloat16"  # bfloat16, float16, int8 or float32
+    use_speculative_decoding: bool = False
+    num_assistant_tokens: int = 5  # Draft tokens proposed per main-model forward pass
     chunk_length_s: int = 30
-    batch_size: int = 1  # batch_size=1 is best for speculative decoding
+    batch_size: int = 8  # Chunks per encoder/decoder batch for long-form audio
+    compile_encoder: bool = False  # torch.compile the encoder (CUDA graphs); slower startup
+    compile_decoder: bool = False  # Static KV cache + compiled decoder; not with speculative decoding
     no_speech_threshold: float = 0.6
+    silence_rms_threshold: float = 0.002  # Skip transcription below this RMS level; 0 disables
 
 
-@dataclass
+@dataclass(slots=True)
 class RouterConfig:
     """Routing configuration for local Ollama inference."""
 
     ollama_host: str = "http://localhost:11434"
     ollama_model: str = "qwen3:14b"
     ollama_timeout_s: float = 120.0
+    ollama_keep_alive: str = "30m"  # How long Ollama keeps the model loaded after a request
+    response_cache_size: int = 0  # Repeat prompts served from memory; 0 disables
+    response_cache_ttl_s: float = 300.0  # Cached responses expire after this long
 
 
-@dataclass
+@dataclass(slots=True)
 class EditorConfig:
     """Text editing mode configuration."""
 
@@ -49,7 +63,7 @@ class EditorConfig:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class CommandConfig:
     """Keyboard command configuration."""
 
@@ -61,23 +75,25 @@ class CommandConfig:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class OutputConfig:
     """Output configuration."""
 
-    typing_delay_ms: int = 10
+    typing_delay_ms: int = 10  # Per-keystroke delay for the "type" backend
     auto_type: bool = True
+    backend: str = "clipboard"  # "clipboard" (xclip paste) or "type" (xdotool type)
 
 
-@dataclass
+@dataclass(slots=True)
 class NotificationConfig:
     """Notification configuration."""
 
     enabled: bool = True
     timeout_ms: int = 3000
+    backend: str = "stdout"  # "stdout" or "notify-send"
 
 
-@dataclass
+@dataclass(slots=True)
 class HistoryConfig:
     """Interaction history configuration."""
 
@@ -86,7 +102,7 @@ class HistoryConfig:
     max_response_length: int = 10000  # Truncate stored responses beyond this
 
 
-@dataclass
+@dataclass(slots=True)
 class StatusWindowConfig:
     """Persistent floating status window configuration."""
 
@@ -96,7 +112,7 @@ class StatusWindowConfig:
     center_offset_y: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Main configuration container."""
 
@@ -110,101 +126,44 @@ class Config:
     status_window: StatusWindowConfig = field(default_factory=StatusWindowConfig)
 
 
+def _load_section(current: Any, section: dict) -> Any:
+    """Overlay known keys from a TOML section onto a config dataclass.
+
+    Unknown keys are ignored so stale or misspelled options don't break startup.
+    """
+    valid = {f.name for f in fields(current)}
+    overrides = {k: v for k, v in section.items() if k in valid}
+    return replace(current, **overrides) if overrides else current
+
+
 def load_config(config_path: Optional[Path] = None) -> Config:
-    """Load configuration from TOML file."""
+    """
+    Load configuration from TOML file.
+
+    Parsed results are cached per (path, mtime), so repeat calls return the
+    same Config instance until the file changes. Treat it as read-only.
+    """
     path = config_path or CONFIG_FILE
-    config = Config()
 
-    if not path.exists():
-        return config
+    try:
+        key = (str(path), path.stat().st_mtime_ns)
+    except FileNotFoundError:
+        return Config()
+
+    cached = _config_cache.get(key)
+    if cached is not None:
+        return cached
+
+    config = Config()
 
     with open(path, "rb") as f:
         data = tomllib.load(f)
 
-    # Whisper config
-    if "whisper" in data:
-        w = data["whisper"]
-        config.whisper = WhisperConfig(
-            model=w.get("model", config.whisper.model),
-            assistant_model=w.get("assistant_model", config.whisper.assistant_model),
-            device=w.get("device", config.whisper.device),
-            compute_type=w.get("compute_type", config.whisper.compute_type),
-            use_speculative_decoding=w.get(
-                "use_speculative_decoding", config.whisper.use_speculative_decoding
-            ),
-            chunk_length_s=w.get("chunk_length_s", config.whisper.chunk_length_s),
-            batch_size=w.get("batch_size", config.whisper.batch_size),
-            no_speech_threshold=w.get(
-                "no_speech_threshold", config.whisper.no_speech_threshold
-            ),
-        )
-
-    # Router config
-    if "router" in data:
-        r = data["router"]
-        config.router = RouterConfig(
-            ollama_host=r.get("ollama_host", config.router.ollama_host),
-            ollama_model=r.get("ollama_model", config.router.ollama_model),
-            ollama_timeout_s=r.get("ollama_timeout_s", config.router.ollama_timeout_s),
-        )
-
-    # Editor config
-    if "editor" in data:
-        e = data["editor"]
-        config.editor = EditorConfig(
-            enabled=e.get("enabled", config.editor.enabled),
-            triggers=e.get("triggers", config.editor.triggers),
-        )
-
-    # Command config
-    if "commands" in data:
-        c = data["commands"]
-        config.commands = CommandConfig(
-            enabled=c.get("enabled", config.commands.enabled),
-            fuzzy_threshold=c.get("fuzzy_threshold", config.commands.fuzzy_threshold),
-            confirm_destructive=c.get(
-                "confirm_destructive", config.commands.confirm_destructive
-            ),
-            destructive_patterns=c.get(
-                "destructive_patterns", config.commands.destructive_patterns
-            ),
-        )
-
-    # Output config
-    if "output" in data:
-        o = data["output"]
-        config.output = OutputConfig(
-            typing_delay_ms=o.get("typing_delay_ms", config.output.typing_delay_ms),
-            auto_type=o.get("auto_type", config.output.auto_type),
-        )
-
-    # Notification config
-    if "notifications" in data:
-        n = data["notifications"]
-        config.notifications = NotificationConfig(
-            enabled=n.get("enabled", config.notifications.enabled),
-            timeout_ms=n.get("timeout_ms", config.notifications.timeout_ms),
-        )
-
-    # History config
-    if "history" in data:
-        h = data["history"]
-        config.history = HistoryConfig(
-            enabled=h.get("enabled", config.history.enabled),
-            db_path=h.get("db_path", config.history.db_path),
-            max_response_length=h.get(
-                "max_response_length", config.history.max_response_length
-            ),
-        )
-
-    # Status window config
-    if "status_window" in data:
-        sw = data["status_window"]
-        config.status_window = StatusWindowConfig(
-            enabled=sw.get("enabled", config.status_window.enabled),
-            position=sw.get("position", config.status_window.position),
-            margin=sw.get("margin", config.status_window.margin),
-            center_offset_y=sw.get("center_offset_y", config.status_window.center_offset_y),
-        )
+    # Each Config field name doubles as its TOML section name
+    for section_field in fields(Config):
+        name = section_field.name
+        if data.get(name):
+            setattr(config, name, _load_section(getattr(config, name), data[name]))
 
+    _config_cache[key] = config
     return config
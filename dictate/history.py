@@ -1,10 +1,12 @@
 """Interaction history storage for analytics."""
 
 import sqlite3
+import threading
 import time
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from operator import attrgetter
 from pathlib import Path
 from typing import Optional
 
@@ -13,7 +15,7 @@ from typing import Optional
 DEFAULT_DB_DIR = Path.home() / ".local" / "share" / "dictate-agent"
 DEFAULT_DB_PATH = DEFAULT_DB_DIR / "history.db"
 
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 2
 
 CREATE_TABLE = """
 CREATE TABLE IF NOT EXISTS interactions (
@@ -60,19 +62,44 @@ CREATE TABLE IF NOT EXISTS interactions (
     error_summary TEXT
 );
 
-CREATE TABLE IF NOT EXISTS schema_version (
-    version INTEGER PRIMARY KEY
-);
+-- Analytics lookups (added in schema v2)
+CREATE INDEX IF NOT EXISTS idx_interactions_session ON interactions(session_id);
+CREATE INDEX IF NOT EXISTS idx_interactions_timestamp ON interactions(timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_interactions_route
+    ON interactions(route_type) WHERE route_type IS NOT NULL;
 """
 
-
-@dataclass
+# Column order shared by INSERT_SQL and the row tuples built in commit()
+INTERACTION_COLUMNS = (
+    "session_id", "timestamp",
+    "audio_duration_s",
+    "raw_transcription", "corrected_transcription", "transcription_duration_s",
+    "grammar_input", "grammar_output", "grammar_changed", "grammar_error", "grammar_duration_s",
+    "route_type", "route_model", "route_trigger", "route_confidence",
+    "prompt_sent", "response_text", "execution_model", "execution_duration_s",
+    "execution_success", "execution_error",
+    "output_typed", "output_char_count",
+    "total_duration_s", "completed", "error_summary",
+)
+
+INSERT_SQL = (
+    f"INSERT INTO interactions ({', '.join(INTERACTION_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(INTERACTION_COLUMNS))})"
+)
+
+# Queued rows are written when this many accumulate or after the interval
+FLUSH_BATCH_SIZE = 16
+FLUSH_INTERVAL_S = 2.0
+
+
+@dataclass(slots=True)
 class Interaction:
     """Builder for a single interaction record."""
 
     session_id: str = ""
-    timestamp: str = ""
+    timestamp: str = ""  # ISO-8601 UTC, formatted at commit from _start_wall
     _start_time: float = 0.0
+    _start_wall: float = 0.0
 
     # Audio
     audio_duration_s: Optional[float] = None
@@ -113,6 +140,10 @@ class Interaction:
     error_summary: Optional[str] = None
 
 
+# Pulls INTERACTION_COLUMNS off an Interaction as a tuple in one C-level call
+_interaction_row = attrgetter(*INTERACTION_COLUMNS)
+
+
 class HistoryStore:
     """SQLite-backed interaction history."""
 
@@ -121,84 +152,114 @@ class HistoryStore:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._session_id = uuid.uuid4().hex[:12]
         self._conn: Optional[sqlite3.Connection] = None
+        self._pending: list[tuple] = []
+        self._lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
         self._init_db()
 
     def _init_db(self) -> None:
-        self._conn = sqlite3.connect(str(self.db_path))
-        self._conn.execute("PRAGMA journal_mode=WAL")
-        self._conn.executescript(CREATE_TABLE)
-        # Set schema version if not present
-        cursor = self._conn.execute(
-            "SELECT version FROM schema_version LIMIT 1"
+        # Batched writes may be flushed from the timer thread (serialized by _lock).
+        # Autocommit mode: batch flushes issue their own BEGIN IMMEDIATE/COMMIT.
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=128,
         )
-        if cursor.fetchone() is None:
-            self._conn.execute(
-                "INSERT INTO schema_version (version) VALUES (?)",
-                (SCHEMA_VERSION,),
-            )
-        self._conn.commit()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        # Schema version lives in PRAGMA user_version; DDL only runs when it's
+        # behind (new DB or upgrade). The statements are idempotent, so v1 DBs
+        # (which tracked the version in a schema_version table) migrate cleanly.
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            self._conn.executescript(CREATE_TABLE)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
     def begin(self) -> Interaction:
         """Start tracking a new interaction."""
         return Interaction(
             session_id=self._session_id,
-            timestamp=datetime.now(timezone.utc).isoformat(),
             _start_time=time.monotonic(),
+            _start_wall=time.time(),
         )
 
     def commit(self, interaction: Interaction) -> None:
-        """Write a completed interaction to the database."""
+        """
+        Queue a completed interaction for writing.
+
+        Rows are written in batches (on size or after a short delay) so the
+        transaction commit stays off the dictation path. close() flushes.
+        """
         if self._conn is None:
             return
 
         interaction.total_duration_s = (
             time.monotonic() - interaction._start_time
         )
+        if not interaction.timestamp:
+            interaction.timestamp = datetime.fromtimestamp(
+                interaction._start_wall, timezone.utc
+            ).isoformat()
+
+        row = _interaction_row(interaction)
+
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= FLUSH_BATCH_SIZE:
+                self._flush_locked()
+            elif self._flush_timer is None:
+                self._schedule_flush_locked()
+
+    def flush(self) -> None:
+        """Write any queued interactions to the database."""
+        with self._lock:
+            self._flush_locked()
+
+    def _schedule_flush_locked(self) -> None:
+        """Flush from a timer thread after FLUSH_INTERVAL_S. Caller must hold self._lock."""
+        self._flush_timer = threading.Timer(FLUSH_INTERVAL_S, self._timed_flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _timed_flush(self) -> None:
+        """Timer-thread flush: nobody is there to see an exception, so log it."""
+        with self._lock:
+            try:
+                self._flush_locked()
+            except Exception as e:
+                # The rows stay in _pending; try again after another interval
+                print(f"History flush failed, retrying: {e}")
+                if self._conn is not None:
+                    self._schedule_flush_locked()
+
+    def _flush_locked(self) -> None:
+        """Write queued rows in one transaction. Caller must hold self._lock."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        if not self._pending or self._conn is None:
+            return
 
-        self._conn.execute(
-            """INSERT INTO interactions (
-                session_id, timestamp,
-                audio_duration_s,
-                raw_transcription, corrected_transcription, transcription_duration_s,
-                grammar_input, grammar_output, grammar_changed, grammar_error, grammar_duration_s,
-                route_type, route_model, route_trigger, route_confidence,
-                prompt_sent, response_text, execution_model, execution_duration_s,
-                execution_success, execution_error,
-                output_typed, output_char_count,
-                total_duration_s, completed, error_summary
-            ) VALUES (
-                ?, ?,
-                ?,
-                ?, ?, ?,
-                ?, ?, ?, ?, ?,
-                ?, ?, ?, ?,
-                ?, ?, ?, ?,
-                ?, ?,
-                ?, ?,
-                ?, ?, ?
-            )""",
-            (
-                interaction.session_id, interaction.timestamp,
-                interaction.audio_duration_s,
-                interaction.raw_transcription, interaction.corrected_transcription,
-                interaction.transcription_duration_s,
-                interaction.grammar_input, interaction.grammar_output,
-                interaction.grammar_changed, interaction.grammar_error,
-                interaction.grammar_duration_s,
-                interaction.route_type, interaction.route_model,
-                interaction.route_trigger, interaction.route_confidence,
-                interaction.prompt_sent, interaction.response_text,
-                interaction.execution_model, interaction.execution_duration_s,
-                interaction.execution_success, interaction.execution_error,
-                interaction.output_typed, interaction.output_char_count,
-                interaction.total_duration_s, interaction.completed,
-                interaction.error_summary,
-            ),
-        )
-        self._conn.commit()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(INSERT_SQL, self._pending)
+            self._conn.execute("COMMIT")
+        except BaseException:
+            # Includes the SystemExit a stop signal raises mid-flush, so the
+            # flush in close() can start a fresh transaction
+            self._conn.execute("ROLLBACK")
+            raise
+        self._pending.clear()
 
     def close(self) -> None:
-        """Close the database connection."""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
+        """Flush queued interactions and close the database connection."""
+        with self._lock:
+            try:
+                self._flush_locked()
+            finally:
+                if self._conn:
+                    self._conn.close()
+                    self._conn = None
@@ -3,11 +3,29 @@ Local model executor using Ollama for fast, offline inference.
 """
 
 import subprocess
+import threading
 import time
 import urllib.request
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Optional
 
+try:
+    import ollama
+except ImportError:  # Optional: TYPE/TIMER routes work without it
+    ollama = None
+
+
+# execute_edit prompt, split around its two variable fields
+_EDIT_PROMPT_HEAD = (
+    "Transform the following text according to the instruction.\n"
+    "Return ONLY the transformed text, nothing else.\n"
+    "\n"
+    "Instruction: "
+)
+_EDIT_PROMPT_TEXT = "\n\nText to transform:\n"
+_EDIT_PROMPT_TAIL = "\n\nTransformed text:"
+
 
 @dataclass
 class ExecutionResult:
@@ -26,27 +44,76 @@ class LocalExecutor:
         host: str = "http://localhost:11434",
         model: str = "qwen3:14b",
         timeout_s: float = 120.0,
+        cache_size: int = 0,
+        cache_ttl_s: float = 300.0,
+        keep_alive: str = "30m",
     ):
         self.host = host
         self.model = model
         self.timeout = timeout_s
-
-    def execute(self, prompt: str, model: str | None = None) -> ExecutionResult:
+        self.keep_alive = keep_alive
+        self.cache_size = cache_size
+        self.cache_ttl_s = cache_ttl_s
+        # (model, normalized prompt) -> (monotonic time stored, result)
+        self._cache: OrderedDict[tuple[str, str], tuple[float, ExecutionResult]] = OrderedDict()
+        self._client = None  # ollama.Client, created on first use and reused
+
+    def _get_client(self):
+        """Return the shared Ollama client, keeping its HTTP connection pool alive."""
+        if self._client is None:
+            self._client = ollama.Client(host=self.host, timeout=self.timeout)
+        return self._client
+
+    def execute(
+        self, prompt: str, model: str | None = None, use_cache: bool = True
+    ) -> ExecutionResult:
         """
         Execute a prompt via Ollama.
 
+        When enabled, repeat prompts (case, whitespace and trailing punctuation
+        ignored) are answered from a small LRU cache of successful responses
+        until they are cache_ttl_s old.
+
         Args:
             prompt: The prompt to send to the local model
             model: Optional model override
+            use_cache: Whether to consult and populate the response cache
 
         Returns:
             ExecutionResult with response or error
         """
         use_model = model or self.model
-        try:
-            import ollama
+        key = (use_model, _normalize_prompt(prompt))
+        if use_cache and self.cache_size > 0:
+            cached = self._cache.get(key)
+            if cached is not None:
+                stored_at, cached_result = cached
+                if time.monotonic() - stored_at < self.cache_ttl_s:
+                    self._cache.move_to_end(key)
+                    print(f"Ollama cache hit ({use_model}): {prompt[:50]}...")
+                    return cached_result
+                del self._cache[key]
+
+        result = self._generate(prompt, use_model)
+
+        if use_cache and self.cache_size > 0 and result.success:
+            self._cache[key] = (time.monotonic(), result)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return result
+
+    def _generate(self, prompt: str, use_model: str) -> ExecutionResult:
+        """Send a prompt to Ollama and wrap the outcome."""
+        if ollama is None:
+            return ExecutionResult(
+                success=False,
+                response="",
+                error="ollama package not installed. Install with: pip install ollama",
+            )
 
-            client = ollama.Client(host=self.host, timeout=self.timeout)
+        try:
+            client = self._get_client()
 
             print(f"Executing Ollama ({use_model}): {prompt[:50]}...")
 
@@ -56,6 +123,7 @@ class LocalExecutor:
                 options={
                     "num_predict": 2048,
                 },
+                keep_alive=self.keep_alive,
             )
 
             text = response.get("response", "").strip()
@@ -66,12 +134,6 @@ class LocalExecutor:
                 response=text,
             )
 
-        except ImportError:
-            return ExecutionResult(
-                success=False,
-                response="",
-                error="ollama package not installed. Install with: pip install ollama",
-            )
         except Exception as e:
             error_msg = str(e)
             # Check for common Ollama errors
@@ -87,6 +149,22 @@ class LocalExecutor:
                 error=error_msg,
             )
 
+    def warm_up_async(self) -> None:
+        """Load the model into Ollama's memory in the background."""
+        threading.Thread(target=self._warm_up, daemon=True, name="ollama-warm-up").start()
+
+    def _warm_up(self) -> None:
+        """Internal: an empty prompt makes Ollama load the model without generating."""
+        if ollama is None:
+            return
+        try:
+            self._get_client().generate(
+                model=self.model, prompt="", keep_alive=self.keep_alive
+            )
+            print(f"Ollama model warmed up: {self.model}")
+        except Exception as e:
+            print(f"Ollama warm-up failed: {e}")
+
     def execute_edit(self, instruction: str, selected_text: str) -> ExecutionResult:
         """
         Execute a text editing instruction via Ollama.
@@ -98,17 +176,19 @@ class LocalExecutor:
         Returns:
             ExecutionResult with transformed text
         """
-        prompt = f"""Transform the following text according to the instruction.
-Return ONLY the transformed text, nothing else.
-
-Instruction: {instruction}
+        prompt = (
+            _EDIT_PROMPT_HEAD + instruction
+            + _EDIT_PROMPT_TEXT + selected_text
+            + _EDIT_PROMPT_TAIL
+        )
 
-Text to transform:
-{selected_text}
+        # Edits depend on the selection, so never serve them from cache
+        return self.execute(prompt, use_cache=False)
 
-Transformed text:"""
 
-        return self.execute(prompt)
+def _normalize_prompt(prompt: str) -> str:
+    """Normalize a prompt for cache lookup (case, whitespace, trailing punctuation)."""
+    return " ".join(prompt.lower().split()).rstrip(".,!?")
 
 
 def is_ollama_running(host: str = "http://localhost:11434", timeout: float = 1.0) -> bool:
@@ -173,9 +253,7 @@ def check_local_dependencies() -> list[tuple[str, str]]:
     """Check local executor dependencies. Returns list of (dep, instruction) missing."""
     missing = []
 
-    try:
-        import ollama
-    except ImportError:
+    if ollama is None:
         missing.append(("ollama", "pip install ollama"))
 
     return missing
@@ -10,25 +10,29 @@ A signal-based daemon that:
 """
 
 import argparse
+import atexit
 import os
+import select
 import signal
-import subprocess
+import socket
 import sys
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from . import __version__
 from .audio import AudioCapture, check_audio_dependencies
 from .config import (
     CONFIG_DIR,
     CONFIG_FILE,
-    MEDIA_STATE_FILE,
+    CONTROL_SOCKET,
+    LEGACY_MEDIA_STATE_FILE,
     PID_FILE,
     load_config,
 )
 from .history import HistoryStore
 from .local_executor import LocalExecutor, check_local_dependencies, ensure_ollama_running
+from .media import MediaController
 from .notify import Notifier, check_notify_dependencies
 from .output import OutputHandler, check_output_dependencies
 from .router import RouteType, Router
@@ -44,16 +48,21 @@ class DictateAgent:
         self.config = load_config()
         self.running = True
         self.recording = False
+        self._media_was_playing = False
+        self._shut_down = False
 
         # Initialize components
         self.notifier = Notifier(
             enabled=self.config.notifications.enabled,
             default_timeout_ms=self.config.notifications.timeout_ms,
+            backend=self.config.notifications.backend,
         )
         self.audio = AudioCapture()
+        self.media = MediaController()
         self.output = OutputHandler(
             typing_delay_ms=self.config.output.typing_delay_ms,
             auto_type=self.config.output.auto_type,
+            backend=self.config.output.backend,
         )
         self.router = Router(self.config.router)
 
@@ -71,13 +80,18 @@ class DictateAgent:
             self.status_window = None
 
         # Ensure Ollama is running for local model inference
-        ensure_ollama_running(host=self.config.router.ollama_host)
+        ollama_ready = ensure_ollama_running(host=self.config.router.ollama_host)
 
         self.local_executor = LocalExecutor(
             host=self.config.router.ollama_host,
             model=self.config.router.ollama_model,
             timeout_s=self.config.router.ollama_timeout_s,
+            cache_size=self.config.router.response_cache_size,
+            cache_ttl_s=self.config.router.response_cache_ttl_s,
+            keep_alive=self.config.router.ollama_keep_alive,
         )
+        if ollama_ready:
+            self.local_executor.warm_up_async()
         self.timer_executor = TimerExecutor()
 
         # History
@@ -98,11 +112,17 @@ class DictateAgent:
             on_error=self._on_transcriber_error,
         )
 
+        # Clean up even if the process exits without going through stop()
+        atexit.register(self._shutdown)
+
     def _on_transcriber_ready(self) -> None:
         """Called when transcriber models are loaded."""
+        model_info = f"Model: {self.config.whisper.model.split('/')[-1]}"
+        if self.transcriber.speculative_decoding:
+            model_info += f" + {self.config.whisper.assistant_model.split('/')[-1]} (speculative)"
         self.notifier.notify(
             "Dictate Agent Ready",
-            f"Model: {self.config.whisper.model.split('/')[-1]}",
+            model_info,
             "audio-input-microphone",
             3000,
         )
@@ -147,11 +167,9 @@ class DictateAgent:
             return
 
         # Pause media if playing
-        if self._is_media_playing():
-            MEDIA_STATE_FILE.write_text("playing")
+        self._media_was_playing = self._is_media_playing()
+        if self._media_was_playing:
             self._pause_media()
-        elif MEDIA_STATE_FILE.exists():
-            MEDIA_STATE_FILE.unlink()
 
         # Start recording
         self.audio.start()
@@ -298,36 +316,21 @@ class DictateAgent:
 
     def _is_media_playing(self) -> bool:
         """Check if media is currently playing."""
-        try:
-            result = subprocess.run(
-                ["playerctl", "status"],
-                capture_output=True,
-                text=True,
-                timeout=1,
-            )
-            return result.stdout.strip() == "Playing"
-        except Exception:
-            return False
+        return self.media.is_playing()
 
     def _pause_media(self) -> None:
         """Pause any playing media."""
-        try:
-            subprocess.run(["playerctl", "pause"], capture_output=True, timeout=1)
-        except Exception:
-            pass
+        self.media.pause()
 
     def _resume_media(self) -> None:
         """Resume media playback."""
-        try:
-            subprocess.run(["playerctl", "play"], capture_output=True, timeout=1)
-        except Exception:
-            pass
+        self.media.play()
 
     def _resume_media_if_needed(self) -> None:
         """Resume media if it was playing before dictation."""
-        if MEDIA_STATE_FILE.exists():
+        if self._media_was_playing:
+            self._media_was_playing = False
             try:
-                MEDIA_STATE_FILE.unlink()
                 self._resume_media()
             except Exception:
                 pass
@@ -336,15 +339,38 @@ class DictateAgent:
         """Stop the daemon."""
         print("\nStopping...")
         self.running = False
+        self._shutdown()
+        sys.exit(0)
+
+    def _shutdown(self) -> None:
+        """Release subprocesses, connections and files. Safe to call twice."""
+        if self._shut_down:
+            return
+        self._shut_down = True
 
-        # Cleanup
-        if self.history:
-            self.history.close()
+        # Ask the capture itself: a stop signal can land inside
+        # stop_recording() after self.recording is cleared but before
+        # parecord has been stopped
+        self.recording = False
+        if self.audio.is_recording:
+            self.audio.stop()
+        self.audio.cleanup()
 
-        if PID_FILE.exists():
-            PID_FILE.unlink()
+        for close in (
+            self.notifier.close,
+            self.media.close,
+            self.status_window.close if self.status_window else None,
+            self.history.close if self.history else None,
+        ):
+            if close is None:
+                continue
+            try:
+                close()
+            except Exception as e:
+                print(f"Shutdown error: {e}")
 
-        os._exit(0)
+        PID_FILE.unlink(missing_ok=True)
+        CONTROL_SOCKET.unlink(missing_ok=True)
 
     def run(self) -> None:
         """Run the daemon main loop."""
@@ -356,23 +382,120 @@ class DictateAgent:
         # Load transcription models in background
         self.transcriber.load_models_async()
 
-        print("Waiting for SIGUSR1 to toggle recording...")
+        self._setup_event_loop()
+
+        print("Waiting for toggle (control socket or SIGUSR1)...")
         print("Use: dictate-toggle or kill -USR1 $(cat ~/.config/dictate-agent/dictate.pid)")
         print("Cancel: dictate-cancel or kill -USR2 $(cat ~/.config/dictate-agent/dictate.pid)")
         print("Press Ctrl+C to quit.")
         print()
 
-        # Wait for signals
+        # Wait for events (signals arrive as bytes on the wakeup pipe)
         while self.running:
-            signal.pause()
+            for fd, _events in self._epoll.poll():
+                self._fd_handlers[fd](fd)
+
+    def _setup_event_loop(self) -> None:
+        """Route signals through a wakeup pipe so they're handled in the loop.
+
+        SIGINT/SIGTERM are the exception: they stop the daemon immediately,
+        even mid-transcription. Other event sources register their fd in
+        self._epoll and a callback in self._fd_handlers.
+        """
+        self._signal_actions: dict[int, Callable[[], None]] = {
+            signal.SIGUSR1: self.toggle,
+            signal.SIGUSR2: self.cancel,
+        }
+        self._epoll = select.epoll()
+        self._fd_handlers: dict[int, Callable[[int], None]] = {}
+
+        wake_r, wake_w = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+        signal.set_wakeup_fd(wake_w, warn_on_full_buffer=False)
+        for sig in self._signal_actions:
+            # A Python-level handler is required for the wakeup fd to be written
+            signal.signal(sig, lambda sig, frame: None)
+        signal.signal(signal.SIGINT, self._on_stop_signal)
+        signal.signal(signal.SIGTERM, self._on_stop_signal)
+        self._epoll.register(wake_r, select.EPOLLIN)
+        self._fd_handlers[wake_r] = self._on_signal_fd
+
+        self._control_actions: dict[bytes, Callable[[], None]] = {
+            b"toggle": self.toggle,
+            b"cancel": self.cancel,
+            b"stop": self.stop,
+        }
+        self._control_conns: dict[int, socket.socket] = {}
+        try:
+            CONTROL_SOCKET.unlink(missing_ok=True)
+            self._control = socket.socket(
+                socket.AF_UNIX, socket.SOCK_SEQPACKET | socket.SOCK_NONBLOCK | socket.SOCK_CLOEXEC
+            )
+            self._control.bind(str(CONTROL_SOCKET))
+            os.chmod(CONTROL_SOCKET, 0o600)
+            self._control.listen()
+        except OSError as e:
+            print(f"Control socket unavailable, signals only: {e}")
+            return
+        self._epoll.register(self._control.fileno(), select.EPOLLIN)
+        self._fd_handlers[self._control.fileno()] = self._on_control_accept
+
+    def _on_stop_signal(self, signum: int, frame) -> None:
+        """Unwind out of whatever is running; atexit then runs _shutdown()."""
+        print("\nStopping...")
+        self.running = False
+        raise SystemExit(0)
+
+    def _on_signal_fd(self, fd: int) -> None:
+        """Dispatch signals queued on the wakeup pipe."""
+        try:
+            data = os.read(fd, 4096)
+        except BlockingIOError:
+            return
+        for signum in data:
+            action = self._signal_actions.get(signum)
+            if action:
+                action()
+
+    def _on_control_accept(self, fd: int) -> None:
+        """Accept a dictate-toggle/dictate-cancel connection."""
+        try:
+            conn, _ = self._control.accept()
+        except BlockingIOError:
+            return
+        conn.setblocking(False)
+        self._control_conns[conn.fileno()] = conn
+        self._epoll.register(conn.fileno(), select.EPOLLIN)
+        self._fd_handlers[conn.fileno()] = self._on_control_message
+
+    def _on_control_message(self, fd: int) -> None:
+        """Run the command sent on a control connection, then close it."""
+        conn = self._control_conns.pop(fd)
+        try:
+            command = conn.recv(64).strip()
+        except BlockingIOError:
+            # Spurious wake-up: keep waiting for the command
+            self._control_conns[fd] = conn
+            return
+        except OSError:
+            command = b""
+        self._epoll.unregister(fd)
+        del self._fd_handlers[fd]
+        conn.close()
+
+        action = self._control_actions.get(command)
+        if action:
+            action()
+        elif command:
+            print(f"Unknown control command: {command!r}")
 
 
 def check_all_dependencies() -> list[tuple[str, str]]:
     """Check all dependencies. Returns list of (dep, instruction) missing."""
+    config = load_config()
     missing = []
     missing.extend(check_audio_dependencies())
-    missing.extend(check_output_dependencies())
-    missing.extend(check_notify_dependencies())
+    missing.extend(check_output_dependencies(config.output.backend))
+    missing.extend(check_notify_dependencies(config.notifications.backend))
     missing.extend(check_transcription_dependencies())
     missing.extend(check_status_window_dependencies())
     # Ollama is optional for basic operation (TYPE mode works without it)
@@ -419,25 +542,13 @@ def main() -> None:
     # Write PID file
     PID_FILE.write_text(str(os.getpid()))
 
+    # Media state is kept in memory now; drop the file older versions left
+    LEGACY_MEDIA_STATE_FILE.unlink(missing_ok=True)
+
     # Create agent
     agent = DictateAgent()
 
-    # Setup signal handlers
-    def handle_sigint(sig, frame):
-        agent.stop()
-
-    def handle_sigusr1(sig, frame):
-        agent.toggle()
-
-    def handle_sigusr2(sig, frame):
-        agent.cancel()
-
-    signal.signal(signal.SIGINT, handle_sigint)
-    signal.signal(signal.SIGTERM, handle_sigint)
-    signal.signal(signal.SIGUSR1, handle_sigusr1)
-    signal.signal(signal.SIGUSR2, handle_sigusr2)
-
-    # Run
+    # Run (installs signal handlers)
     agent.run()
 
 
@@ -0,0 +1,132 @@
+"""
+Media playback control over MPRIS (D-Bus).
+
+Talks to players directly on the session bus via jeepney so pausing and
+resuming around a recording doesn't fork a process. Falls back to
+playerctl when jeepney or the session bus is unavailable.
+"""
+
+import subprocess
+from shutil import which
+from typing import Optional
+
+try:
+    from jeepney import DBusAddress, Properties, new_method_call, unwrap_msg
+    from jeepney.io.blocking import open_dbus_connection
+except ImportError:  # Optional: falls back to playerctl
+    open_dbus_connection = None
+
+MPRIS_PREFIX = "org.mpris.MediaPlayer2."
+MPRIS_PATH = "/org/mpris/MediaPlayer2"
+MPRIS_PLAYER_INTERFACE = "org.mpris.MediaPlayer2.Player"
+DBUS_TIMEOUT_S = 1.0
+
+_PLAYERCTL = which("playerctl") or "playerctl"
+
+
+class MediaController:
+    """Pauses and resumes media players around a recording."""
+
+    def __init__(self):
+        self._conn = None
+        self._player: Optional[str] = None  # Bus name of the player last seen playing
+
+        if open_dbus_connection is not None:
+            try:
+                self._conn = open_dbus_connection(bus="SESSION")
+            except Exception as e:
+                print(f"D-Bus unavailable, using playerctl for media control: {e}")
+
+    def is_playing(self) -> bool:
+        """Check if any media player is currently playing."""
+        if self._conn is None:
+            return self._playerctl_status() == "Playing"
+
+        try:
+            for name in self._list_players():
+                if self._playback_status(name) == "Playing":
+                    self._player = name
+                    return True
+        except Exception:
+            pass
+        return False
+
+    def pause(self) -> None:
+        """Pause the player found by is_playing()."""
+        if self._conn is None or self._player is None:
+            self._playerctl("pause")
+            return
+        self._call_player("Pause")
+
+    def play(self) -> None:
+        """Resume the player found by is_playing()."""
+        if self._conn is None or self._player is None:
+            self._playerctl("play")
+            return
+        self._call_player("Play")
+
+    def close(self) -> None:
+        """Close the D-Bus connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ------------------------------------------------------------------
+    # D-Bus (MPRIS)
+    # ------------------------------------------------------------------
+
+    def _list_players(self) -> list[str]:
+        """Return bus names of all MPRIS players on the session bus."""
+        bus = DBusAddress(
+            "/org/freedesktop/DBus",
+            bus_name="org.freedesktop.DBus",
+            interface="org.freedesktop.DBus",
+        )
+        reply = self._conn.send_and_get_reply(
+            new_method_call(bus, "ListNames"), timeout=DBUS_TIMEOUT_S
+        )
+        (names,) = unwrap_msg(reply)
+        return [n for n in names if n.startswith(MPRIS_PREFIX)]
+
+    def _playback_status(self, bus_name: str) -> str:
+        """Return a player's PlaybackStatus (Playing, Paused or Stopped)."""
+        player = DBusAddress(MPRIS_PATH, bus_name=bus_name, interface=MPRIS_PLAYER_INTERFACE)
+        reply = self._conn.send_and_get_reply(
+            Properties(player).get("PlaybackStatus"), timeout=DBUS_TIMEOUT_S
+        )
+        ((_signature, status),) = unwrap_msg(reply)
+        return status
+
+    def _call_player(self, method: str) -> None:
+        """Invoke a Player method (Play/Pause) on the remembered player."""
+        player = DBusAddress(MPRIS_PATH, bus_name=self._player, interface=MPRIS_PLAYER_INTERFACE)
+        try:
+            unwrap_msg(
+                self._conn.send_and_get_reply(
+                    new_method_call(player, method), timeout=DBUS_TIMEOUT_S
+                )
+            )
+        except Exception:
+            # Player went away (ServiceUnknown etc.) — forget it
+            self._player = None
+
+    # ------------------------------------------------------------------
+    # playerctl fallback
+    # ------------------------------------------------------------------
+
+    def _playerctl_status(self) -> str:
+        try:
+            result = subprocess.run(
+                [_PLAYERCTL, "status"],
+                capture_output=True,
+                timeout=1,
+            )
+            return result.stdout.strip().decode("utf-8", "replace")
+        except Exception:
+            return ""
+
+    def _playerctl(self, command: str) -> None:
+        try:
+            subprocess.run([_PLAYERCTL, command], capture_output=True, timeout=1)
+        except Exception:
+            pass
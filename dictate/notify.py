@@ -1,6 +1,45 @@
-"""Console-based notifier (no desktop notifications)."""
-
-from dataclasses import dataclass
+"""
+Notifications - console breadcrumbs or desktop toasts.
+
+Backends:
+- "stdout" (default): log to stdout, no external tools
+- "notify-send": desktop notifications, sent straight to
+  org.freedesktop.Notifications over D-Bus when jeepney is installed,
+  otherwise via the notify-send binary
+"""
+
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from shutil import which
+from typing import Any, Optional
+
+try:
+    from jeepney import DBusAddress, new_method_call, unwrap_msg
+    from jeepney.io.blocking import open_dbus_connection
+except ImportError:  # Optional: falls back to notify-send
+    open_dbus_connection = None
+
+_NOTIFY_SEND_PATH = which("notify-send")
+_NOTIFY_SEND = _NOTIFY_SEND_PATH or "notify-send"
+# Replace our previous notification instead of stacking
+_REPLACE_HINT = ("-h", "string:x-canonical-private-synchronous:dictate-agent")
+
+_NOTIFICATIONS = (
+    DBusAddress(
+        "/org/freedesktop/Notifications",
+        bus_name="org.freedesktop.Notifications",
+        interface="org.freedesktop.Notifications",
+    )
+    if open_dbus_connection is not None
+    else None
+)
+
+# Canned (title, message, icon, timeout_ms) payloads
+_RECORDING = ("Recording...", "Toggle again to stop", "audio-input-microphone", 30000)
+_TRANSCRIBING = ("Transcribing...", "Processing speech", "emblem-synchronizing", 30000)
+_NO_SPEECH = ("No speech detected", "Try speaking louder", "dialog-warning", 2000)
+_NOT_RUNNING = ("Dictate not running", "Start with: dictate-agent", "dialog-warning", 3000)
 
 
 @dataclass
@@ -10,6 +49,19 @@ class Notifier:
     enabled: bool = True
     default_timeout_ms: int = 3000
     app_name: str = "Dictate Agent"
+    backend: str = "stdout"  # "stdout" or "notify-send"
+    # Single worker: notify-send runs off the pipeline thread but stays in order,
+    # so a late "Transcribing..." can never replace "Done!"
+    _pool: Optional[ThreadPoolExecutor] = field(default=None, init=False, repr=False)
+    # Session-bus connection (used only from the worker) and last notification ID
+    _dbus: Any = field(default=None, init=False, repr=False)
+    _dbus_failed: bool = field(default=False, init=False, repr=False)
+    _last_id: int = field(default=0, init=False, repr=False)
+    # Constant head of every notify-send command line
+    _argv_prefix: tuple[str, ...] = field(default=(), init=False, repr=False)
+
+    def __post_init__(self):
+        self._argv_prefix = (_NOTIFY_SEND, "-a", self.app_name)
 
     def notify(
         self,
@@ -32,30 +84,92 @@ class Notifier:
         if not self.enabled:
             return
 
-        # Instead of hitting notify-send/dunst, log to stdout so the daemon
-        # still emits useful breadcrumbs when running interactively.
+        if self.backend == "notify-send":
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="notify")
+            self._pool.submit(
+                self._notify_desktop,
+                title, message, icon, timeout_ms or self.default_timeout_ms, replace,
+            )
+            return
+
+        # Log to stdout so the daemon still emits useful breadcrumbs when
+        # running interactively.
         line = f"[{self.app_name}] {title}"
         if message:
             line = f"{line}: {message}"
         print(line)
 
+    def close(self) -> None:
+        """Wait for queued notifications to be sent and stop the worker."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        if self._dbus is not None:
+            self._dbus.close()
+            self._dbus = None
+
+    def _notify_desktop(
+        self, title: str, message: str, icon: str, timeout_ms: int, replace: bool
+    ) -> None:
+        """Show a desktop notification, preferring D-Bus over forking notify-send."""
+        if self._dbus is None and not self._dbus_failed and open_dbus_connection is not None:
+            try:
+                self._dbus = open_dbus_connection(bus="SESSION")
+            except Exception as e:
+                self._dbus_failed = True
+                print(f"D-Bus unavailable, using notify-send: {e}")
+
+        if self._dbus is not None:
+            try:
+                self._notify_dbus(title, message, icon, timeout_ms, replace)
+                return
+            except Exception as e:
+                print(f"D-Bus notification error: {e}")
+
+        self._notify_send(title, message, icon, timeout_ms, replace)
+
+    def _notify_dbus(
+        self, title: str, message: str, icon: str, timeout_ms: int, replace: bool
+    ) -> None:
+        """Call org.freedesktop.Notifications.Notify, replacing our last toast if asked."""
+        msg = new_method_call(
+            _NOTIFICATIONS,
+            "Notify",
+            "susssasa{sv}i",
+            (
+                self.app_name,
+                self._last_id if replace else 0,
+                icon,
+                title,
+                message,
+                [],
+                {},
+                timeout_ms,
+            ),
+        )
+        (self._last_id,) = unwrap_msg(self._dbus.send_and_get_reply(msg, timeout=2))
+
+    def _notify_send(
+        self, title: str, message: str, icon: str, timeout_ms: int, replace: bool
+    ) -> None:
+        """Show a desktop notification via notify-send."""
+        cmd = [*self._argv_prefix, "-i", icon, "-t", str(timeout_ms)]
+        if replace:
+            cmd += _REPLACE_HINT
+        cmd += (title, message)
+        try:
+            subprocess.run(cmd, capture_output=True, timeout=2)
+        except Exception as e:
+            print(f"Notification error: {e}")
+
     def recording(self) -> None:
         """Show recording notification."""
-        self.notify(
-            "Recording...",
-            "Toggle again to stop",
-            "audio-input-microphone",
-            30000,
-        )
+        self.notify(*_RECORDING)
 
     def transcribing(self) -> None:
         """Show transcribing notification."""
-        self.notify(
-            "Transcribing...",
-            "Processing speech",
-            "emblem-synchronizing",
-            30000,
-        )
+        self.notify(*_TRANSCRIBING)
 
     def processing(self, model: str) -> None:
         """Show processing notification."""
@@ -88,23 +202,15 @@ class Notifier:
 
     def no_speech(self) -> None:
         """Show no speech detected notification."""
-        self.notify(
-            "No speech detected",
-            "Try speaking louder",
-            "dialog-warning",
-            2000,
-        )
+        self.notify(*_NO_SPEECH)
 
     def not_running(self) -> None:
         """Show daemon not running notification."""
-        self.notify(
-            "Dictate not running",
-            "Start with: dictate-agent",
-            "dialog-warning",
-            3000,
-        )
+        self.notify(*_NOT_RUNNING)
 
 
-def check_notify_dependencies() -> list[tuple[str, str]]:
-    """Notifications no longer depend on external tools."""
+def check_notify_dependencies(backend: str = "stdout") -> list[tuple[str, str]]:
+    """Check notification dependencies for the given backend. Returns (cmd, package) missing."""
+    if backend == "notify-send" and _NOTIFY_SEND_PATH is None and open_dbus_connection is None:
+        return [("notify-send", "libnotify")]
     return []
@@ -1,13 +1,25 @@
 """
-Output handling - typing text into active window via clipboard paste.
+Output handling - typing text into active window.
 
-Uses xclip + xdotool ctrl+v for near-instant output regardless of text length.
-Falls back to xdotool type if xclip is unavailable.
+Backends:
+- "clipboard" (default): xclip + xdotool ctrl+v, near-instant regardless of length
+- "type": xdotool type, one synthetic keystroke per character (typing_delay_ms apart)
+  for windows that don't accept pastes
 """
 
+import select
 import subprocess
-import time
 from dataclasses import dataclass
+from shutil import which
+
+# Resolved once at import; exec'ing an absolute path skips the PATH search
+_BINARIES = {cmd: which(cmd) for cmd in ("xclip", "xdotool")}
+_XCLIP = _BINARIES["xclip"] or "xclip"
+_XDOTOOL = _BINARIES["xdotool"] or "xdotool"
+
+# Selection requests xclip serves before exiting, and the max wait for them
+_PASTE_REQUESTS = 2
+_PASTE_TIMEOUT_S = 0.2
 
 
 @dataclass
@@ -16,12 +28,11 @@ class OutputHandler:
 
     typing_delay_ms: int = 10
     auto_type: bool = True
+    backend: str = "clipboard"  # "clipboard" or "type"
 
     def type_text(self, text: str) -> bool:
         """
-        Type text into the active window via clipboard paste.
-
-        Saves and restores the user's clipboard contents.
+        Type text into the active window using the configured backend.
 
         Args:
             text: Text to type
@@ -32,16 +43,50 @@ class OutputHandler:
         if not text or not self.auto_type:
             return False
 
+        text = text.strip()
+        if not text:
+            return False
+
+        if self.backend == "type":
+            return self._type_keystrokes(text)
+        return self._type_via_clipboard(text)
+
+    def _type_keystrokes(self, text: str) -> bool:
+        """Type text with xdotool, one keystroke per character."""
         try:
-            text = text.strip()
-            if not text:
-                return False
+            subprocess.run(
+                [
+                    _XDOTOOL, "type", "--clearmodifiers",
+                    "--delay", str(self.typing_delay_ms), "--", text,
+                ],
+                check=True,
+                # Allow for the per-character delay on long responses
+                timeout=5 + len(text) * self.typing_delay_ms / 1000,
+            )
+            return True
+        except Exception as e:
+            print(f"Error typing text: {e}")
+            return False
+
+    def _type_via_clipboard(self, text: str) -> bool:
+        """
+        Type text into the active window via clipboard paste.
 
+        Saves and restores the user's clipboard contents. Our text is served
+        by a short-lived xclip that exits once the paste has been fetched.
+
+        Args:
+            text: Text to paste (already stripped)
+
+        Returns:
+            True if successful
+        """
+        try:
             # Save current clipboard
             saved_clip = None
             try:
                 result = subprocess.run(
-                    ["xclip", "-selection", "clipboard", "-o"],
+                    [_XCLIP, "-selection", "clipboard", "-o"],
                     capture_output=True, timeout=1,
                 )
                 if result.returncode == 0:
@@ -49,28 +94,53 @@ class OutputHandler:
             except Exception:
                 pass
 
-            # Set clipboard to our text and paste
-            subprocess.run(
-                ["xclip", "-selection", "clipboard"],
-                input=text.encode(), check=True, timeout=1,
-            )
-            subprocess.run(
-                ["xdotool", "key", "--clearmodifiers", "ctrl+v"],
-                check=True, timeout=2,
+            # Serve our text for a single paste. -quiet keeps xclip in the
+            # foreground (the default -silent mode forks) and -loops makes it
+            # exit once the target app has fetched the selection (typically a
+            # TARGETS query plus the data), so we wait on that instead of a
+            # fixed sleep.
+            server = subprocess.Popen(
+                [
+                    _XCLIP, "-quiet", "-selection", "clipboard",
+                    "-loops", str(_PASTE_REQUESTS),
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
             )
+            try:
+                server.stdin.write(text.encode())
+                server.stdin.close()
 
-            # Brief delay to let paste complete before restoring clipboard
-            time.sleep(0.05)
+                # In -quiet mode xclip reports "Waiting for ..." on stderr once
+                # it owns the selection
+                select.select([server.stderr], [], [], _PASTE_TIMEOUT_S)
+
+                subprocess.run(
+                    [_XDOTOOL, "key", "--clearmodifiers", "ctrl+v"],
+                    check=True, timeout=2,
+                )
 
-            # Restore original clipboard
-            if saved_clip is not None:
                 try:
-                    subprocess.run(
-                        ["xclip", "-selection", "clipboard"],
-                        input=saved_clip, timeout=1,
-                    )
-                except Exception:
-                    pass
+                    server.wait(timeout=_PASTE_TIMEOUT_S)
+                except subprocess.TimeoutExpired:
+                    pass  # App made fewer requests; restoring below takes over
+
+                # Restore original clipboard
+                if saved_clip is not None:
+                    try:
+                        subprocess.run(
+                            [_XCLIP, "-selection", "clipboard"],
+                            input=saved_clip, timeout=1,
+                        )
+                    except Exception:
+                        pass
+            finally:
+                # Stop serving our text (if still running) and reap the process
+                if server.poll() is None:
+                    server.terminate()
+                server.wait()
+                server.stderr.close()
 
             return True
 
@@ -79,13 +149,9 @@ class OutputHandler:
             return False
 
 
-def check_output_dependencies() -> list[tuple[str, str]]:
-    """Check output dependencies. Returns list of (cmd, package) missing."""
-    missing = []
-
-    for cmd, pkg in [("xdotool", "xdotool"), ("xclip", "xclip")]:
-        result = subprocess.run(["which", cmd], capture_output=True)
-        if result.returncode != 0:
-            missing.append((cmd, pkg))
-
-    return missing
+def check_output_dependencies(backend: str = "clipboard") -> list[tuple[str, str]]:
+    """Check output dependencies for the given backend. Returns list of (cmd, package) missing."""
+    required = [("xdotool", "xdotool")]
+    if backend == "clipboard":
+        required.append(("xclip", "xclip"))
+    return [(cmd, pkg) for cmd, pkg in required if _BINARIES[cmd] is None]
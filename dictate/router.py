@@ -8,6 +8,7 @@ Keywords activate different backends:
 - "Edit: ..." / "Fix: ..." etc. -> Local edit mode
 """
 
+import re
 from dataclasses import dataclass
 from enum import Enum
 
@@ -34,6 +35,22 @@ class RouteResult:
     confidence: float  # 0-1 confidence in routing decision
 
 
+# Edit-mode prefixes ("Edit: ...", "fix: ...")
+_EDIT_RE = re.compile(r"(?:edit|fix|change|rewrite|transform):", re.IGNORECASE)
+
+# Trailing punctuation Whisper attaches to a trigger word ("Timer, ...")
+_STRIP_CHARS = ".,!?:;"
+
+# First-word trigger -> (route, model). AI triggers all route to local Ollama.
+_TRIGGER_TABLE: dict[str, tuple[RouteType, str]] = {
+    "timer": (RouteType.TIMER, ""),
+    "simple": (RouteType.LOCAL, "local"),
+    "easy": (RouteType.LOCAL, "local"),
+    "medium": (RouteType.LOCAL, "local"),
+    "hard": (RouteType.LOCAL, "local"),
+}
+
+
 class Router:
     """Routes transcribed text to appropriate handler."""
 
@@ -53,27 +70,23 @@ class Router:
         if not text:
             return RouteResult(RouteType.TYPE, "", text, 1.0)
 
-        lower_text = text.lower()
-
         # Check for edit mode triggers
-        for trigger in ["edit:", "fix:", "change:", "rewrite:", "transform:"]:
-            if lower_text.startswith(trigger):
-                return RouteResult(
-                    route=RouteType.EDIT,
-                    model="local",
-                    text=text[len(trigger) :].strip(),
-                    confidence=1.0,
-                )
-
-        # Check for AI triggers at start — all route to local Ollama
+        match = _EDIT_RE.match(text)
+        if match:
+            return RouteResult(
+                route=RouteType.EDIT,
+                model="local",
+                text=text[match.end() :].strip(),
+                confidence=1.0,
+            )
+
+        # Check for timer/AI triggers at start
         words = text.split(maxsplit=1)
-        first_word = words[0].lower().rstrip(".,!?:;")  # Strip trailing punctuation
-        rest = words[1] if len(words) > 1 else ""
-
-        if first_word == "timer":
-            return RouteResult(RouteType.TIMER, "", rest, 1.0)
-        elif first_word in ("simple", "easy", "medium", "hard"):
-            return RouteResult(RouteType.LOCAL, "local", rest, 1.0)
+        first_word = words[0].lower().rstrip(_STRIP_CHARS)
+        hit = _TRIGGER_TABLE.get(first_word)
+        if hit:
+            rest = words[1] if len(words) > 1 else ""
+            return RouteResult(hit[0], hit[1], rest, 1.0)
 
         # Default: just type the text
         return RouteResult(RouteType.TYPE, "", text, 1.0)
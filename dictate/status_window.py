@@ -63,16 +63,23 @@ class StatusWindow:
         self.center_mode = center_mode
         self._state = WindowState.IDLE
         self._root: Optional[tk.Tk] = None
+        # One prebuilt badge per visible state; _frame is the one packed
+        self._state_frames: dict[WindowState, tk.Frame] = {}
+        self._state_sizes: dict[WindowState, tuple[int, int]] = {}
         self._frame: Optional[tk.Frame] = None
-        self._icon_label: Optional[tk.Label] = None
-        self._text_label: Optional[tk.Label] = None
         self._hide_after_id: Optional[str] = None
         self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Coalesces set_state() calls into one pending _update_ui
+        self._state_lock = threading.Lock()
+        self._pending = False
+        self._screen_size: Optional[tuple[int, int]] = None  # Fixed for the session
 
     def start(self) -> None:
         """Start the window thread. Blocks briefly until tkinter is initialized."""
         t = threading.Thread(target=self._run, daemon=True, name="dictate-status-window")
         t.start()
+        self._thread = t
         self._ready.wait(timeout=3.0)
 
     def _run(self) -> None:
@@ -93,31 +100,40 @@ class StatusWindow:
         root.wm_attributes("-topmost", True)
         root.withdraw()  # Start hidden
 
-        # Outer frame with padding — acts as the visible pill/badge
-        self._frame = tk.Frame(root, bg="#1e1e2e", padx=14, pady=8)
-        self._frame.pack(fill=tk.BOTH, expand=True)
-
-        self._icon_label = tk.Label(
-            self._frame,
-            text="",
-            font=("monospace", 16),
-            bg="#1e1e2e",
-            fg="#ffffff",
-        )
-        self._icon_label.pack(side=tk.LEFT, padx=(0, 6))
-
-        self._text_label = tk.Label(
-            self._frame,
-            text="",
-            font=("Sans", 11, "bold"),
-            bg="#1e1e2e",
-            fg="#ffffff",
-        )
-        self._text_label.pack(side=tk.LEFT)
+        # Build each state's badge once; transitions just swap which is packed
+        for state, cfg in _STATE_CONFIG.items():
+            bg = cfg["bg"]
+            fg = cfg["fg"]
+
+            # Outer frame with padding — acts as the visible pill/badge
+            frame = tk.Frame(root, bg=bg, padx=14, pady=8)
+
+            tk.Label(
+                frame,
+                text=cfg["icon"],
+                font=("monospace", 16),
+                bg=bg,
+                fg=fg,
+            ).pack(side=tk.LEFT, padx=(0, 6))
+
+            tk.Label(
+                frame,
+                text=cfg["label"],
+                font=("Sans", 11, "bold"),
+                bg=bg,
+                fg=fg,
+            ).pack(side=tk.LEFT)
+
+            self._state_frames[state] = frame
 
         self._ready.set()
         root.mainloop()
 
+        # Tear down on this thread: Tcl aborts if its interpreter is
+        # deleted from a different thread at interpreter shutdown.
+        self._root = None
+        root.destroy()
+
     # ------------------------------------------------------------------
     # Internal UI update (must run on the tkinter thread via after())
     # ------------------------------------------------------------------
@@ -137,20 +153,23 @@ class StatusWindow:
             root.withdraw()
             return
 
-        cfg = _STATE_CONFIG[self._state]
-        bg = cfg["bg"]
-        fg = cfg["fg"]
-
-        self._frame.configure(bg=bg)
-        self._icon_label.configure(text=cfg["icon"], bg=bg, fg=fg)
-        self._text_label.configure(text=cfg["label"], bg=bg, fg=fg)
-
-        # Compute geometry and position
-        root.update_idletasks()
-        w = self._frame.winfo_reqwidth()
-        h = self._frame.winfo_reqheight()
-        sw = root.winfo_screenwidth()
-        sh = root.winfo_screenheight()
+        frame = self._state_frames[self._state]
+        if frame is not self._frame:
+            if self._frame is not None:
+                self._frame.pack_forget()
+            frame.pack(fill=tk.BOTH, expand=True)
+            self._frame = frame
+
+        # Compute geometry and position (badge sizes are fixed per state)
+        size = self._state_sizes.get(self._state)
+        if size is None:
+            root.update_idletasks()
+            size = (frame.winfo_reqwidth(), frame.winfo_reqheight())
+            self._state_sizes[self._state] = size
+        w, h = size
+        if self._screen_size is None:
+            self._screen_size = (root.winfo_screenwidth(), root.winfo_screenheight())
+        sw, sh = self._screen_size
         x, y = self._compute_position(w, h, sw, sh)
         root.geometry(f"{w}x{h}+{x}+{y}")
 
@@ -166,7 +185,14 @@ class StatusWindow:
 
     def _set_state_internal(self, state: WindowState) -> None:
         """Set state from within the tkinter thread (used by after() callbacks)."""
-        self._state = state
+        with self._state_lock:
+            self._state = state
+        self._update_ui()
+
+    def _drain(self) -> None:
+        """Apply the latest state requested via set_state()."""
+        with self._state_lock:
+            self._pending = False
         self._update_ui()
 
     def _compute_position(self, w: int, h: int, sw: int, sh: int) -> tuple[int, int]:
@@ -189,11 +215,18 @@ class StatusWindow:
     # ------------------------------------------------------------------
 
     def set_state(self, state: WindowState) -> None:
-        """Thread-safe state update."""
-        if self._root is None:
+        """Thread-safe state update. Redundant or back-to-back calls are coalesced."""
+        root = self._root
+        if root is None:
             return
-        self._state = state
-        self._root.after(0, self._update_ui)
+        with self._state_lock:
+            if state == self._state:
+                return
+            self._state = state
+            if self._pending:
+                return
+            self._pending = True
+        root.after(0, self._drain)
 
     def recording(self) -> None:
         """Show recording indicator."""
@@ -211,6 +244,15 @@ class StatusWindow:
         """Hide the window (return to idle)."""
         self.set_state(WindowState.IDLE)
 
+    def close(self) -> None:
+        """Stop the tkinter main loop and wait for the window thread to exit."""
+        root = self._root
+        if root is None:
+            return
+        root.after(0, root.quit)
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
 
 def check_status_window_dependencies() -> list[tuple[str, str]]:
     """Check that tkinter is available."""
@@ -8,7 +8,9 @@ fires a desktop notification (and optional sound) when it expires.
 
 import re
 import subprocess
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 # Word-form numbers for Whisper transcription output
@@ -28,6 +30,39 @@ UNIT_ALIASES = {
     "hour": "h", "hours": "h", "hr": "h", "hrs": "h", "h": "h",
 }
 
+# "half hour" / "half an hour"
+_HALF_HOUR_RE = re.compile(r"half\s+(?:an?\s+)?hour", re.IGNORECASE)
+
+# Pattern: <number> [and a half] <unit>
+# Sort alternatives longest-first so "minutes" matches before "minute", etc.
+_NUM_ALTS = sorted(WORD_TO_NUM, key=len, reverse=True)
+_UNIT_ALTS = sorted(UNIT_ALIASES, key=len, reverse=True)
+_DURATION_RE = re.compile(
+    r"(\d+|" + "|".join(re.escape(w) for w in _NUM_ALTS) + r")"
+    r"(?:\s+and\s+a\s+half)?"
+    r"\s+"
+    r"(" + "|".join(re.escape(u) for u in _UNIT_ALTS) + r")"
+    r"(?=\s|$)",  # must be followed by space or end-of-string
+    re.IGNORECASE,
+)
+
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600}
+
+# How long execute() waits for systemd-run before reporting success
+_SYSTEMD_RUN_WAIT_S = 0.5
+# After which a hung systemd-run is killed and reported
+_SYSTEMD_RUN_TIMEOUT_S = 5.0
+
+# Unit script for the alarm sound: loops the sound in the background while
+# "$@" (dunstify) blocks until dismissed, then stops the loop
+_SOUND_LOOP_SCRIPT = "; ".join([
+    "SOUND_FILE=$HOME/.config/dictate-agent/sounds/timer_alarm.wav",
+    '( while true; do play -q "$SOUND_FILE" 2>/dev/null; sleep 1; done ) & SOUND_PID=$!',
+    '"$@"',
+    "kill $SOUND_PID 2>/dev/null",
+    "wait $SOUND_PID 2>/dev/null",
+])
+
 
 @dataclass
 class TimerResult:
@@ -65,33 +100,29 @@ def parse_duration(text: str) -> tuple[Optional[int], str]:
     if not text:
         return None, text
 
+    # Fast path: "<digits> <unit> [label]" with no further duration to consume
+    parts = text.split(None, 2)
+    if len(parts) >= 2 and parts[0].isdecimal():
+        unit = UNIT_ALIASES.get(parts[1].lower())
+        rest = parts[2] if len(parts) == 3 else ""
+        next_word = rest.split(None, 1)[0].lower() if rest else ""
+        if unit and not next_word.isdecimal() and next_word not in WORD_TO_NUM:
+            return int(parts[0]) * _UNIT_SECONDS[unit], rest
+
     original = text
     total_seconds = 0
     found_any = False
 
     # Handle "half hour" / "half an hour" at the start
-    half_hour_match = re.match(r"half\s+(?:an?\s+)?hour", text, re.IGNORECASE)
+    half_hour_match = _HALF_HOUR_RE.match(text)
     if half_hour_match:
         total_seconds += 1800
         text = text[half_hour_match.end():].strip()
         found_any = True
 
-    # Pattern: <number> [and a half] <unit>
-    # Sort alternatives longest-first so "minutes" matches before "minute", etc.
-    num_alts = sorted(WORD_TO_NUM.keys(), key=len, reverse=True)
-    unit_alts = sorted(UNIT_ALIASES.keys(), key=len, reverse=True)
-    pattern = re.compile(
-        r"(\d+|" + "|".join(re.escape(w) for w in num_alts) + r")"
-        r"(?:\s+and\s+a\s+half)?"
-        r"\s+"
-        r"(" + "|".join(re.escape(u) for u in unit_alts) + r")"
-        r"(?=\s|$)",  # must be followed by space or end-of-string
-        re.IGNORECASE,
-    )
-
     # Try matching duration at current position, consume and repeat
     while True:
-        match = pattern.match(text)
+        match = _DURATION_RE.match(text)
         if not match:
             break
 
@@ -117,7 +148,7 @@ def parse_duration(text: str) -> tuple[Optional[int], str]:
 
     # Fallback: search for duration anywhere in text (handles filler words)
     if not found_any:
-        match = pattern.search(original)
+        match = _DURATION_RE.search(original)
         if match:
             num = _parse_word_number(match.group(1))
             unit = UNIT_ALIASES.get(match.group(2).lower())
@@ -138,6 +169,7 @@ def parse_duration(text: str) -> tuple[Optional[int], str]:
     return total_seconds, text
 
 
+@lru_cache(maxsize=128)
 def _format_duration_human(seconds: int) -> str:
     """Format seconds into a human-readable string."""
     parts = []
@@ -154,6 +186,7 @@ def _format_duration_human(seconds: int) -> str:
     return " ".join(parts)
 
 
+@lru_cache(maxsize=128)
 def _format_duration_systemd(seconds: int) -> str:
     """Format seconds into systemd OnActiveSec format (e.g. '5m', '1h30m')."""
     parts = []
@@ -168,6 +201,20 @@ def _format_duration_systemd(seconds: int) -> str:
     return "".join(parts) or "0s"
 
 
+def _log_systemd_run_failure(proc: subprocess.Popen) -> None:
+    """Wait for a slow systemd-run and log its error, if any; kill it if hung."""
+    try:
+        _, stderr = proc.communicate(timeout=_SYSTEMD_RUN_TIMEOUT_S - _SYSTEMD_RUN_WAIT_S)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        print(f"Timer error: systemd-run timed out after {_SYSTEMD_RUN_TIMEOUT_S:g}s")
+        return
+    if proc.returncode != 0:
+        error = stderr.decode("utf-8", "replace").strip() or "systemd-run failed"
+        print(f"Timer error: {error}")
+
+
 class TimerExecutor:
     """Sets timers using systemd-run transient timer units."""
 
@@ -203,43 +250,48 @@ class TimerExecutor:
         # Uses dunstify (blocks until dismissed) with a looping sound.
         # Sound loops in background; dunstify blocks until user clicks
         # the notification; then the sound loop is killed.
+        dunstify = [
+            "dunstify", "-a", "Dictate Agent", "-i", "alarm-symbolic",
+            "-u", "critical", "-t", "0",
+            f"Timer: {display_label}",
+            f"{human_duration} elapsed",
+            "--action=default,Dismiss",
+        ]
         if self.sound_enabled:
-            notify_cmd = (
-                f'SOUND_FILE=$HOME/.config/dictate-agent/sounds/timer_alarm.wav; '
-                f'( while true; do play -q "$SOUND_FILE" 2>/dev/null; sleep 1; done ) & '
-                f'SOUND_PID=$!; '
-                f'dunstify -a "Dictate Agent" -i alarm-symbolic -u critical '
-                f'-t 0 '
-                f'"Timer: {display_label}" '
-                f'"{human_duration} elapsed" '
-                f'--action="default,Dismiss"; '
-                f'kill $SOUND_PID 2>/dev/null; wait $SOUND_PID 2>/dev/null'
-            )
+            # Label and duration are passed as positional args, not spliced
+            # into the script, so quotes in the label can't break it
+            unit_cmd = ["/bin/bash", "-c", _SOUND_LOOP_SCRIPT, "dictate-timer", *dunstify]
         else:
-            notify_cmd = (
-                f'dunstify -a "Dictate Agent" -i alarm-symbolic -u critical '
-                f'-t 0 '
-                f'"Timer: {display_label}" '
-                f'"{human_duration} elapsed" '
-                f'--action="default,Dismiss"'
-            )
+            # No shell needed without the sound loop
+            unit_cmd = dunstify
 
         try:
-            result = subprocess.run(
+            proc = subprocess.Popen(
                 [
                     "systemd-run",
                     "--user",
                     "--on-active=" + systemd_duration,
                     "--description=Dictate Agent Timer",
-                    "/bin/bash", "-c", notify_cmd,
+                    *unit_cmd,
                 ],
-                capture_output=True,
-                text=True,
-                timeout=5,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
             )
-
-            if result.returncode != 0:
-                error = result.stderr.strip() or "systemd-run failed"
+            try:
+                proc.wait(timeout=_SYSTEMD_RUN_WAIT_S)
+            except subprocess.TimeoutExpired:
+                # Still talking to systemd: report success now, log failure later
+                threading.Thread(
+                    target=_log_systemd_run_failure, args=(proc,), daemon=True
+                ).start()
+                stderr = b""
+            else:
+                stderr = proc.stderr.read()
+                proc.stderr.close()
+
+            if proc.returncode:
+                # Only decode stderr when we actually report it
+                error = stderr.decode("utf-8", "replace").strip() or "systemd-run failed"
                 print(f"Timer error: {error}")
                 return TimerResult(
                     success=False,
@@ -259,12 +311,6 @@ class TimerExecutor:
                 response="",
                 error="systemd-run not found. Is systemd available?",
             )
-        except subprocess.TimeoutExpired:
-            return TimerResult(
-                success=False,
-                response="",
-                error="Timed out creating timer",
-            )
         except Exception as e:
             return TimerResult(
                 success=False,
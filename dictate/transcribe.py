@@ -3,19 +3,50 @@ Optimized Whisper transcription using HuggingFace Transformers.
 
 Features:
 - large-v3-turbo model (6-8x faster than large-v3)
-- Speculative decoding with distil-whisper (additional 2x speedup)
+- Optional speculative decoding with distil-whisper
 - SDPA attention (works on Blackwell/RTX 5080)
 - Pre-loaded models for instant inference
 """
 
+import contextlib
+import math
+import os
+import re
 import threading
+import time
+import traceback
 import warnings
+import wave
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Optional
 
+# Read at the first CUDA allocation: growable segments keep chunked long-form
+# audio from fragmenting the caching allocator into fresh cudaMallocs
+os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
+
+import numpy as np
 import torch
 
+try:
+    from torch.nn.attention import SDPBackend, sdpa_kernel
+except ImportError:  # torch < 2.3
+    sdpa_kernel = None
+else:
+    # Attention kernels in order of preference: cuDNN (fastest on
+    # Hopper/Blackwell, torch >= 2.5), then flash, then memory-efficient.
+    # Math comes last, for inputs no fused kernel accepts (e.g. pre-Ampere)
+    _SDPA_BACKENDS = [
+        backend
+        for backend in (
+            getattr(SDPBackend, "CUDNN_ATTENTION", None),
+            SDPBackend.FLASH_ATTENTION,
+            SDPBackend.EFFICIENT_ATTENTION,
+            SDPBackend.MATH,
+        )
+        if backend is not None
+    ]
+
 # Suppress transformers deprecation warnings
 warnings.filterwarnings("ignore", message=".*chunk_length_s.*is very experimental.*")
 warnings.filterwarnings("ignore", message=".*forced_decoder_ids.*deprecated.*")
@@ -23,12 +54,109 @@ warnings.filterwarnings("ignore", message=".*forced_decoder_ids.*deprecated.*")
 from transformers import (
     AutoModelForSpeechSeq2Seq,
     AutoProcessor,
+    BitsAndBytesConfig,
+    CompileConfig,
     pipeline as hf_pipeline,
 )
 
 from .config import WhisperConfig
 
 
+# Common transcription corrections (case-sensitive, matched in one pass)
+_CORRECTIONS = {
+    # Name corrections (Whisper often mishears "Claude")
+    ".clod": ".claude",
+    ".cloud": ".claude",
+    ".clawed": ".claude",
+    " clod": " claude",
+    " cloud": " claude",
+    " clawed": " claude",
+    "Clod": "Claude",
+    "Cloud": "Claude",
+    "Clawed": "Claude",
+    # Slash command corrections
+    "research code base": "/research_codebase",
+    "Research code base": "/research_codebase",
+    "research codebase": "/research_codebase",
+    "Research codebase": "/research_codebase",
+    "create plan": "/create_plan",
+    "Create plan": "/create_plan",
+    "implement plan": "/implement_plan",
+    "Implement plan": "/implement_plan",
+    "validate plan": "/validate_plan",
+    "Validate plan": "/validate_plan",
+    "create handoff": "/create_handoff",
+    "Create handoff": "/create_handoff",
+    "create hand off": "/create_handoff",
+    "Create hand off": "/create_handoff",
+}
+# Longest alternatives first so overlapping keys prefer the fuller match
+_CORRECTION_RE = re.compile(
+    "|".join(map(re.escape, sorted(_CORRECTIONS, key=len, reverse=True)))
+)
+
+
+def _correction_for(match: "re.Match[str]") -> str:
+    return _CORRECTIONS[match.group(0)]
+
+
+# Decoder token limit per 30s chunk
+MAX_NEW_TOKENS = 128
+# Generous upper bound on tokens per second of speech (~2x fast English speech)
+MAX_TOKENS_PER_SECOND = 8
+
+
+def _short_form_call_kwargs(duration_s: float, decode_kwargs: Optional[dict] = None) -> dict:
+    """
+    Per-call pipeline kwargs for a recording that fits in one chunk.
+
+    Caps decoding near the most a speaker could say in this time, so a short
+    clip can't run on to the per-chunk limit. decode_kwargs (e.g. the static
+    cache for a compiled decoder) are added alongside. The pipeline only
+    accepts these through generate_kwargs, which it merges over those bound
+    at construction.
+    """
+    max_new_tokens = min(
+        MAX_NEW_TOKENS, max(16, math.ceil(duration_s * MAX_TOKENS_PER_SECOND))
+    )
+    return {"generate_kwargs": {**(decode_kwargs or {}), "max_new_tokens": max_new_tokens}}
+
+
+def _compiled_for_batch_one(compiled: Callable, eager: Callable, batch_arg: str) -> Callable:
+    """
+    Route batch-size-1 calls to a compiled forward and the rest to eager.
+
+    batch_arg names the tensor whose first dimension is the batch; it's taken
+    from the first positional argument when not passed by keyword.
+    """
+
+    def forward(*args, **kwargs):
+        batch = kwargs.get(batch_arg, args[0] if args else None)
+        if batch is not None and batch.shape[0] == 1:
+            return compiled(*args, **kwargs)
+        return eager(*args, **kwargs)
+
+    return forward
+
+
+def _read_wav(path: Path) -> Optional[dict]:
+    """
+    Read a 16-bit mono WAV as float32 samples in [-1, 1).
+
+    Returns pipeline input ({"raw", "sampling_rate"}), or None if the file
+    isn't 16-bit mono PCM. The pipeline resamples if the rate isn't 16kHz.
+    """
+    try:
+        with wave.open(str(path), "rb") as w:
+            if w.getsampwidth() != 2 or w.getnchannels() != 1:
+                return None
+            rate = w.getframerate()
+            pcm = np.frombuffer(w.readframes(w.getnframes()), dtype="<i2")
+    except (OSError, EOFError, wave.Error):
+        return None
+    return {"raw": pcm.astype(np.float32) / 32768.0, "sampling_rate": rate}
+
+
 @dataclass
 class TranscriptionResult:
     """Result of transcription."""
@@ -58,12 +186,39 @@ class Transcriber:
         self.on_error = on_error
 
         self.pipe = None
+        self.short_pipe = None  # Non-chunked pipeline for recordings that fit in one chunk
+        self.assistant = None  # Draft model for speculative decoding
+        # Extra generate kwargs for short_pipe calls (static cache when the
+        # decoder is compiled); the chunked pipeline never gets them
+        self._short_decode_kwargs: dict = {}
         self.model_loaded = threading.Event()
         self.model_error: Optional[str] = None
 
-        # Determine device and dtype
+        # Determine device and dtype. compute_type "int8" keeps float16 for the
+        # layers that stay unquantized (see _quantization_kwargs).
         self.device = "cuda:0" if config.device == "cuda" and torch.cuda.is_available() else "cpu"
-        self.torch_dtype = torch.float16 if self.device.startswith("cuda") else torch.float32
+        if not self.device.startswith("cuda") or config.compute_type == "float32":
+            self.torch_dtype = torch.float32
+        elif (
+            config.compute_type == "bfloat16"
+            and torch.cuda.get_device_capability(self.device)[0] >= 8
+        ):
+            # Ampere+ (native bf16; is_bf16_supported() also counts emulation):
+            # FP32's exponent range, so no FP16 overflow clamping
+            self.torch_dtype = torch.bfloat16
+        else:
+            self.torch_dtype = torch.float16
+
+        if self.device.startswith("cuda"):
+            # Let any remaining fp32 matmuls/convs use TF32 tensor cores
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.allow_tf32 = True
+            # Encoder conv stem always sees 30s of features: let cuDNN
+            # benchmark once and reuse the fastest algorithm
+            torch.backends.cudnn.benchmark = True
+
+        # Pipelines get no device when the model was dispatched by device_map
+        self._pipe_device: Optional[str] = self.device
 
     def load_models_async(self) -> None:
         """Load models in background thread."""
@@ -77,14 +232,24 @@ class Transcriber:
             print(f"Device: {self.device}, dtype: {self.torch_dtype}")
 
             # Load main model with SDPA attention (Blackwell compatible)
+            quantization = self._quantization_kwargs(skip_modules=["decoder", "proj_out"])
             model = AutoModelForSpeechSeq2Seq.from_pretrained(
                 self.config.model,
                 dtype=self.torch_dtype,
                 low_cpu_mem_usage=True,
                 use_safetensors=True,
                 attn_implementation="sdpa",
+                **quantization,
             )
-            model.to(self.device)
+            if quantization:
+                # Already placed by device_map; 8-bit models can't be moved
+                self._pipe_device = None
+            else:
+                model.to(self.device)
+                if self.config.compute_type == "int8" and self.device == "cpu":
+                    model = torch.ao.quantization.quantize_dynamic(
+                        model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
 
             processor = AutoProcessor.from_pretrained(self.config.model)
 
@@ -92,16 +257,32 @@ class Transcriber:
                 "language": "en",
                 "task": "transcribe",
                 "return_timestamps": True,
-                "max_new_tokens": 128,
+                "max_new_tokens": MAX_NEW_TOKENS,
                 "no_repeat_ngram_size": 3,
             }
 
             # Note: speculative decoding (assistant_model) is incompatible with
             # Whisper's chunked pipeline — its custom generate_with_fallback path
             # doesn't route assistant_model to assisted generation, causing it to
-            # leak into forward(). Chunked long-form support is the better tradeoff.
+            # leak into forward(). So it only runs in the short-form pipeline.
             if self.config.use_speculative_decoding:
-                print("Speculative decoding skipped (incompatible with chunked pipeline)")
+                self.assistant = self._load_assistant()
+
+            # Recordings that fit in one chunk skip chunking and timestamps
+            # (which only serve to stitch chunks, and double the decoded tokens)
+            short_generate_kwargs = {**generate_kwargs, "return_timestamps": False}
+            if self.assistant is not None:
+                short_generate_kwargs["assistant_model"] = self.assistant
+            self.short_pipe = hf_pipeline(
+                "automatic-speech-recognition",
+                model=model,
+                tokenizer=processor.tokenizer,
+                feature_extractor=processor.feature_extractor,
+                dtype=self.torch_dtype,
+                device=self._pipe_device,
+                batch_size=1,
+                generate_kwargs=short_generate_kwargs,
+            )
 
             # Pipeline handles chunking automatically for audio >30s
             self.pipe = hf_pipeline(
@@ -110,12 +291,21 @@ class Transcriber:
                 tokenizer=processor.tokenizer,
                 feature_extractor=processor.feature_extractor,
                 dtype=self.torch_dtype,
-                device=self.device,
+                device=self._pipe_device,
                 chunk_length_s=self.config.chunk_length_s,
                 batch_size=self.config.batch_size,
                 generate_kwargs=generate_kwargs,
             )
 
+            compiled = (
+                self.config.compile_encoder or self.config.compile_decoder
+            ) and self._compile_model(model)
+            if not compiled and self.device.startswith("cuda"):
+                try:
+                    self._warm_up()
+                except Exception as e:
+                    print(f"Warm-up failed: {e}")
+
             self.model_loaded.set()
             print("Models loaded. Ready for transcription!")
 
@@ -130,6 +320,131 @@ class Transcriber:
             if self.on_error:
                 self.on_error(str(e))
 
+    def _quantization_kwargs(self, skip_modules: list[str]) -> dict:
+        """
+        from_pretrained kwargs for compute_type "int8" on CUDA.
+
+        Quantizes linear layers to int8 with bitsandbytes, except those under
+        skip_modules, which stay float16. For the main model that's the decoder
+        and output projection, so final tokens aren't affected. Returns {} when
+        not applicable.
+        """
+        if self.config.compute_type != "int8" or not self.device.startswith("cuda"):
+            return {}
+        try:
+            import bitsandbytes  # noqa: F401
+        except ImportError:
+            print("bitsandbytes not installed; loading Whisper in float16")
+            return {}
+        return {
+            "quantization_config": BitsAndBytesConfig(
+                load_in_8bit=True,
+                llm_int8_skip_modules=skip_modules,
+            ),
+            "device_map": self.device,
+        }
+
+    def _compile_model(self, model) -> bool:
+        """
+        torch.compile the encoder and/or decoder and warm up before reporting ready.
+
+        Whisper pads every input to 30s of features, so at batch size 1 the
+        encoder always sees the same shape and "reduce-overhead" can replay a
+        captured CUDA graph. Larger chunked batches vary in size, so they run
+        eagerly rather than recompiling mid-dictation.
+
+        The decoder is compiled by generate() itself, which does so whenever
+        it decodes into a static KV cache on CUDA. Only short_pipe calls ask
+        for one, so the chunked pipeline's batches always decode eagerly.
+
+        Falls back to eager mode on any failure. Returns whether the model
+        was compiled (and so already warmed up).
+        """
+        if not self.device.startswith("cuda") or self._pipe_device is None:
+            print("torch.compile needs CUDA without int8; skipping")
+            return False
+
+        compile_decoder = self.config.compile_decoder
+        if compile_decoder and self.assistant is not None:
+            # Assisted generation doesn't support a static cache
+            print("Decoder compilation is incompatible with speculative decoding; skipping it")
+            compile_decoder = False
+
+        encoder = model.get_encoder()
+        eager_encoder_forward = encoder.forward
+        try:
+            if self.config.compile_encoder:
+                print("Compiling Whisper encoder...")
+                encoder.forward = _compiled_for_batch_one(
+                    torch.compile(eager_encoder_forward, mode="reduce-overhead", dynamic=False),
+                    eager_encoder_forward,
+                    batch_arg="input_features",
+                )
+            if compile_decoder:
+                print("Compiling Whisper decoder...")
+                self._short_decode_kwargs = {
+                    "cache_implementation": "static",
+                    "compile_config": CompileConfig(fullgraph=True, mode="reduce-overhead"),
+                }
+
+            # Trigger compilation and graph capture. The second run captures
+            # the decode step once the first has compiled.
+            self._warm_up(runs=2 if compile_decoder else 1)
+        except Exception as e:
+            encoder.forward = eager_encoder_forward
+            self._short_decode_kwargs = {}
+            print(f"Compilation failed, using eager mode: {e}")
+            return False
+        return True
+
+    def _warm_up(self, runs: int = 1) -> None:
+        """
+        Run silence through each pipeline before reporting ready.
+
+        Loads the CUDA kernels, sizes the allocator's pools and captures any
+        compiled graphs, so the first real recording isn't the slow one.
+        Whisper pads every window to 30s, so a second of audio hits the same
+        shapes as a full chunk. short_pipe decodes with its full token budget
+        so any static cache is allocated at the size later calls reuse.
+        """
+        silence = np.zeros(16000, dtype=np.float32)
+        for pipe, call_kwargs in (
+            (self.pipe, {}),
+            (self.short_pipe, {"generate_kwargs": self._short_decode_kwargs}),
+        ):
+            for _ in range(runs):
+                with self._inference_context():
+                    pipe({"raw": silence, "sampling_rate": 16000}, **call_kwargs)
+
+    def _load_assistant(self):
+        """
+        Load the draft model for speculative decoding.
+
+        Returns None (no speculative decoding) if it fails to load.
+        """
+        try:
+            print(f"Loading assistant model: {self.config.assistant_model}")
+            # The draft only proposes tokens the main model verifies, so int8
+            # can't change the output; only the acceptance rate may drop
+            quantization = self._quantization_kwargs(skip_modules=["proj_out"])
+            assistant = AutoModelForSpeechSeq2Seq.from_pretrained(
+                self.config.assistant_model,
+                dtype=self.torch_dtype,
+                low_cpu_mem_usage=True,
+                use_safetensors=True,
+                attn_implementation="sdpa",
+                **quantization,
+            )
+            if not quantization:
+                assistant.to(self.device)
+            assistant.generation_config.num_assistant_tokens = (
+                self.config.num_assistant_tokens
+            )
+            return assistant
+        except Exception as e:
+            print(f"Speculative decoding disabled (assistant failed to load): {e}")
+            return None
+
     def transcribe(self, audio_path: Path) -> Optional[TranscriptionResult]:
         """
         Transcribe audio file using HuggingFace pipeline with automatic
@@ -152,17 +467,33 @@ class Transcriber:
             return None
 
         try:
-            import time as _time
-
-            # Compute duration from WAV file (16kHz, 16-bit mono = 32000 bytes/sec)
-            file_size = audio_path.stat().st_size
-            duration_s = max(0, (file_size - 44)) / (16000 * 2)
-            print(f"[timing] Audio: {duration_s:.1f}s ({file_size} bytes)")
-
-            # Pipeline chunks audio automatically for recordings >30s
-            t0 = _time.monotonic()
-            result = self.pipe(str(audio_path))
-            t1 = _time.monotonic()
+            # Decode the WAV in-process; anything unexpected goes through
+            # the pipeline's own ffmpeg-based loader
+            audio = _read_wav(audio_path)
+            if audio is not None:
+                duration_s = len(audio["raw"]) / audio["sampling_rate"]
+            else:
+                # 16kHz, 16-bit mono = 32000 bytes/sec
+                audio = str(audio_path)
+                duration_s = max(0, (audio_path.stat().st_size - 44)) / (16000 * 2)
+            print(f"[timing] Audio: {duration_s:.1f}s")
+
+            # Skip the model entirely on silent recordings (fumbled hotkey etc.);
+            # Whisper tends to hallucinate text on silence
+            threshold = self.config.silence_rms_threshold
+            if threshold > 0 and not isinstance(audio, str):
+                samples = audio["raw"]
+                rms = float(np.sqrt(np.mean(np.square(samples)))) if samples.size else 0.0
+                if rms < threshold:
+                    print(f"Skipping silent audio (RMS {rms:.4f} < {threshold})")
+                    return None
+
+            pipe, call_kwargs = self._pipeline_for(duration_s)
+
+            t0 = time.monotonic()
+            with self._inference_context():
+                result = pipe(audio, **call_kwargs)
+            t1 = time.monotonic()
             print(f"[timing] Transcription: {t1 - t0:.2f}s")
             text = result["text"].strip()
 
@@ -179,44 +510,42 @@ class Transcriber:
 
         except Exception as e:
             print(f"Transcription error: {e}")
-            import traceback
             traceback.print_exc()
             return None
 
+    def _pipeline_for(self, duration_s: float) -> tuple:
+        """
+        Pick the pipeline and per-call kwargs for a recording.
+
+        Single-chunk recordings use the short-form pipeline (speculative
+        decoding or the compiled decoder when enabled); the main one chunks
+        longer audio and always decodes with its construction-time kwargs.
+        """
+        if duration_s <= self.config.chunk_length_s:
+            return self.short_pipe, _short_form_call_kwargs(duration_s, self._short_decode_kwargs)
+        return self.pipe, {}
+
     def _apply_corrections(self, text: str) -> str:
-        """Apply common transcription corrections."""
-        # Name corrections (Whisper often mishears "Claude")
-        corrections = [
-            (".clod", ".claude"),
-            (".cloud", ".claude"),
-            (".clawed", ".claude"),
-            (" clod", " claude"),
-            (" cloud", " claude"),
-            (" clawed", " claude"),
-            ("Clod", "Claude"),
-            ("Cloud", "Claude"),
-            ("Clawed", "Claude"),
-            # Slash command corrections
-            ("research code base", "/research_codebase"),
-            ("Research code base", "/research_codebase"),
-            ("research codebase", "/research_codebase"),
-            ("Research codebase", "/research_codebase"),
-            ("create plan", "/create_plan"),
-            ("Create plan", "/create_plan"),
-            ("implement plan", "/implement_plan"),
-            ("Implement plan", "/implement_plan"),
-            ("validate plan", "/validate_plan"),
-            ("Validate plan", "/validate_plan"),
-            ("create handoff", "/create_handoff"),
-            ("Create handoff", "/create_handoff"),
-            ("create hand off", "/create_handoff"),
-            ("Create hand off", "/create_handoff"),
-        ]
-
-        for old, new in corrections:
-            text = text.replace(old, new)
-
-        return text
+        """Apply common transcription corrections in a single regex pass."""
+        return _CORRECTION_RE.sub(_correction_for, text)
+
+    def _inference_context(self) -> contextlib.ExitStack:
+        """inference_mode, preferring the fused SDPA kernels on CUDA."""
+        stack = contextlib.ExitStack()
+        stack.enter_context(torch.inference_mode())
+        if sdpa_kernel is not None and self.device.startswith("cuda"):
+            try:
+                backends = sdpa_kernel(_SDPA_BACKENDS, set_priority=True)
+            except TypeError:
+                # torch < 2.6 can't reorder backends; its default order applies
+                backends = sdpa_kernel(_SDPA_BACKENDS)
+            stack.enter_context(backends)
+        return stack
+
+    @property
+    def speculative_decoding(self) -> bool:
+        """Whether short recordings are decoded with the assistant model."""
+        return self.assistant is not None
 
     def is_ready(self) -> bool:
         """Check if transcriber is ready."""
@@ -0,0 +1,62 @@
+"""Tests for TOML config loading."""
+
+import os
+from dataclasses import fields
+from pathlib import Path
+
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib
+
+from dictate.config import Config, WhisperConfig, _load_section, load_config
+
+EXAMPLE_CONFIG = Path(__file__).resolve().parent.parent / "config" / "config.example.toml"
+
+
+def test_load_section_overrides_known_keys_only():
+    section = _load_section(WhisperConfig(), {"batch_size": 2, "no_such_option": True})
+    assert section.batch_size == 2
+    assert not hasattr(section, "no_such_option")
+
+
+def test_load_section_without_overrides_returns_same_instance():
+    current = WhisperConfig()
+    assert _load_section(current, {"no_such_option": 1}) is current
+
+
+def test_missing_file_gives_defaults(tmp_path):
+    assert load_config(tmp_path / "missing.toml") == Config()
+
+
+def test_load_config_reads_sections(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text('[whisper]\nbatch_size = 4\n\n[router]\nollama_model = "small"\n')
+    config = load_config(path)
+    assert config.whisper.batch_size == 4
+    assert config.router.ollama_model == "small"
+    assert config.editor == Config().editor
+
+
+def test_load_config_cached_until_mtime_changes(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text("[whisper]\nbatch_size = 4\n")
+    first = load_config(path)
+    assert load_config(path) is first
+
+    path.write_text("[whisper]\nbatch_size = 2\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = load_config(path)
+    assert second is not first
+    assert second.whisper.batch_size == 2
+
+
+def test_example_config_only_uses_known_options():
+    with open(EXAMPLE_CONFIG, "rb") as f:
+        data = tomllib.load(f)
+    sections = {f.name: f.default_factory() for f in fields(Config)}
+    for name, values in data.items():
+        assert name in sections, f"unknown section [{name}]"
+        known = {f.name for f in fields(sections[name])}
+        assert set(values) <= known, f"unknown keys in [{name}]: {set(values) - known}"
@@ -0,0 +1,97 @@
+"""Tests for batched history writes and schema migration."""
+
+import sqlite3
+
+from dictate.history import (
+    CREATE_TABLE,
+    FLUSH_BATCH_SIZE,
+    SCHEMA_VERSION,
+    HistoryStore,
+)
+
+
+def _row_count(db_path) -> int:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM interactions").fetchone()[0]
+
+
+def test_commit_is_batched_until_flush(tmp_path):
+    db_path = tmp_path / "history.db"
+    store = HistoryStore(db_path)
+    interaction = store.begin()
+    interaction.raw_transcription = "hello"
+    store.commit(interaction)
+    assert _row_count(db_path) == 0
+
+    store.flush()
+    assert _row_count(db_path) == 1
+    store.close()
+
+
+def test_full_batch_is_written_immediately(tmp_path):
+    db_path = tmp_path / "history.db"
+    store = HistoryStore(db_path)
+    for _ in range(FLUSH_BATCH_SIZE):
+        store.commit(store.begin())
+    assert _row_count(db_path) == FLUSH_BATCH_SIZE
+    store.close()
+
+
+def test_close_flushes_pending_rows(tmp_path):
+    db_path = tmp_path / "history.db"
+    store = HistoryStore(db_path)
+    interaction = store.begin()
+    interaction.route_type = "type"
+    store.commit(interaction)
+    store.close()
+
+    with sqlite3.connect(db_path) as conn:
+        row = conn.execute("SELECT route_type, timestamp, total_duration_s FROM interactions")
+        route_type, timestamp, total_duration_s = row.fetchone()
+    assert route_type == "type"
+    assert timestamp.endswith("+00:00")
+    assert total_duration_s >= 0
+
+
+def test_failed_flush_rolls_back_and_keeps_rows(tmp_path):
+    db_path = tmp_path / "history.db"
+    store = HistoryStore(db_path)
+    store.commit(store.begin())
+    store._pending.append(("too", "short"))  # executemany fails on this row
+    try:
+        store.flush()
+    except sqlite3.ProgrammingError:
+        pass
+    assert not store._conn.in_transaction
+    assert len(store._pending) == 2
+
+    store._pending.pop()
+    store.close()
+    assert _row_count(db_path) == 1
+
+
+def test_v1_database_is_migrated(tmp_path):
+    db_path = tmp_path / "history.db"
+    # v1 layout: the table without the v2 indexes, version kept in a table
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(CREATE_TABLE.split("-- Analytics")[0])
+        conn.execute("CREATE TABLE schema_version (version INTEGER)")
+        conn.execute("INSERT INTO schema_version (version) VALUES (1)")
+        conn.execute(
+            "INSERT INTO interactions (session_id, timestamp) VALUES ('old', '2025-01-01')"
+        )
+
+    store = HistoryStore(db_path)
+    store.commit(store.begin())
+    store.close()
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        indexes = {
+            name
+            for (name,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'interactions'"
+            )
+        }
+    assert {"idx_interactions_session", "idx_interactions_timestamp"} <= indexes
+    assert _row_count(db_path) == 2
@@ -0,0 +1,54 @@
+"""Tests for timer duration parsing and formatting."""
+
+import pytest
+
+from dictate.timer_executor import (
+    _format_duration_human,
+    _format_duration_systemd,
+    parse_duration,
+)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("5 minutes", (300, "")),
+        ("15 Minutes", (900, "")),
+        ("90 seconds", (90, "")),
+        ("3 hrs", (10800, "")),
+        ("five minutes check the oven", (300, "check the oven")),
+        ("twenty seconds", (20, "")),
+        ("a minute", (60, "")),
+        ("1 hour 30 minutes", (5400, "")),
+        ("2 and a half minutes", (150, "")),
+        ("half an hour", (1800, "")),
+        ("half hour tea", (1800, "tea")),
+        # Only directly adjacent amounts are summed
+        ("1 hour and 15 minutes stretch", (3600, "and 15 minutes stretch")),
+        # Trailing punctuation on the unit isn't a unit
+        ("10 mins.", (None, "10 mins.")),
+        ("5", (None, "5")),
+        ("nothing here", (None, "nothing here")),
+    ],
+)
+def test_parse_duration(text, expected):
+    assert parse_duration(text) == expected
+
+
+def test_parse_duration_ignores_non_decimal_digits():
+    # "²".isdigit() is True but int() rejects it; the fast path must not crash
+    assert parse_duration("²5 minutes") == (300, "")
+
+
+@pytest.mark.parametrize(
+    ("seconds", "human", "systemd"),
+    [
+        (45, "45 seconds", "45s"),
+        (60, "1 minute", "1m"),
+        (5400, "1 hour 30 minutes", "1h30m"),
+        (3661, "1 hour 1 minute 1 second", "1h1m1s"),
+    ],
+)
+def test_format_duration(seconds, human, systemd):
+    assert _format_duration_human(seconds) == human
+    assert _format_duration_systemd(seconds) == systemd
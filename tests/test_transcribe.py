@@ -0,0 +1,139 @@
+"""Tests for dictate.transcribe: device setup, pipeline kwargs and corrections."""
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+import torch
+from transformers.pipelines.automatic_speech_recognition import (
+    AutomaticSpeechRecognitionPipeline,
+)
+
+from dictate.config import WhisperConfig
+from dictate.transcribe import (
+    _CORRECTIONS,
+    MAX_NEW_TOKENS,
+    Transcriber,
+    _short_form_call_kwargs,
+)
+
+
+def _bare_whisper_pipeline() -> AutomaticSpeechRecognitionPipeline:
+    """A pipeline object with just enough state for _sanitize_parameters."""
+    pipe = AutomaticSpeechRecognitionPipeline.__new__(AutomaticSpeechRecognitionPipeline)
+    pipe.type = "seq2seq_whisper"
+    return pipe
+
+
+@pytest.mark.parametrize("duration_s", [0.3, 1.0, 5.0, 30.0])
+def test_short_form_kwargs_accepted_by_pipeline(duration_s):
+    pipe = _bare_whisper_pipeline()
+    _preprocess, forward, _postprocess = pipe._sanitize_parameters(
+        **_short_form_call_kwargs(duration_s)
+    )
+    assert 16 <= forward["max_new_tokens"] <= MAX_NEW_TOKENS
+
+
+def test_short_form_max_new_tokens_scales_with_duration():
+    def tokens(duration_s):
+        return _short_form_call_kwargs(duration_s)["generate_kwargs"]["max_new_tokens"]
+
+    assert tokens(0.5) == 16
+    assert tokens(5.0) == 40
+    assert tokens(30.0) == MAX_NEW_TOKENS
+
+
+def test_short_form_kwargs_keep_construction_generate_kwargs():
+    pipe = _bare_whisper_pipeline()
+    assistant = object()
+    _, bound, _ = pipe._sanitize_parameters(
+        generate_kwargs={"max_new_tokens": MAX_NEW_TOKENS, "assistant_model": assistant}
+    )
+    _, per_call, _ = pipe._sanitize_parameters(**_short_form_call_kwargs(2.0))
+
+    # Pipeline.__call__ fuses them the same way
+    forward = {**bound, **per_call}
+    assert forward["assistant_model"] is assistant
+    assert forward["max_new_tokens"] == 16
+
+
+def test_static_cache_only_reaches_short_form_calls():
+    transcriber = Transcriber(WhisperConfig(device="cpu", chunk_length_s=30))
+    transcriber.pipe, transcriber.short_pipe = object(), object()
+    # As set by _compile_model when compile_decoder is on
+    transcriber._short_decode_kwargs = {"cache_implementation": "static"}
+
+    pipe, call_kwargs = transcriber._pipeline_for(5.0)
+    assert pipe is transcriber.short_pipe
+    assert call_kwargs["generate_kwargs"]["cache_implementation"] == "static"
+
+    pipe, call_kwargs = transcriber._pipeline_for(90.0)
+    assert pipe is transcriber.pipe
+    assert "cache_implementation" not in call_kwargs.get("generate_kwargs", {})
+
+
+def _apply_corrections(text: str) -> str:
+    return Transcriber(WhisperConfig(device="cpu"))._apply_corrections(text)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("open the .cloud folder", "open the .claude folder"),
+        ("Cloud, research code base now", "Claude, /research_codebase now"),
+        ("Research codebase", "/research_codebase"),
+        ("then create plan and Implement plan", "then /create_plan and /implement_plan"),
+        (" clawed and clod", " claude and claude"),
+        ("nothing to fix here", "nothing to fix here"),
+    ],
+)
+def test_apply_corrections(text, expected):
+    assert _apply_corrections(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Ask Cloud about the .clawed directory, then validate plan.",
+        "Create handoff after research codebase and Research code base",
+        "the cloud is clod and Clawed",
+    ],
+)
+def test_apply_corrections_matches_sequential_replace(text):
+    # The single regex pass must agree with applying each correction in turn
+    expected = text
+    for wrong, right in _CORRECTIONS.items():
+        expected = expected.replace(wrong, right)
+    assert _apply_corrections(text) == expected
+
+
+@pytest.fixture
+def restore_backend_flags():
+    flags = (
+        torch.backends.cudnn.benchmark,
+        torch.backends.cudnn.allow_tf32,
+        torch.backends.cuda.matmul.allow_tf32,
+    )
+    yield
+    (
+        torch.backends.cudnn.benchmark,
+        torch.backends.cudnn.allow_tf32,
+        torch.backends.cuda.matmul.allow_tf32,
+    ) = flags
+
+
+@pytest.mark.parametrize(
+    ("capability", "dtype"),
+    [((8, 0), "bfloat16"), ((7, 5), "float16")],
+)
+def test_cuda_init_settings(monkeypatch, restore_backend_flags, capability, dtype):
+    monkeypatch.setattr(torch.cuda, "is_available", lambda: True)
+    monkeypatch.setattr(torch.cuda, "get_device_capability", lambda device=None: capability)
+    torch.backends.cudnn.benchmark = False
+
+    transcriber = Transcriber(WhisperConfig(device="cuda", compute_type="bfloat16"))
+
+    assert transcriber.torch_dtype == getattr(torch, dtype)
+    # Fixed 3000-frame encoder input: cuDNN autotunes the conv stem once
+    assert torch.backends.cudnn.benchmark